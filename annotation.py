@@ -0,0 +1,123 @@
+"""읽기 페이지 주석 (단어별 학습 상태 표시)
+
+페이지를 한 번만 토큰화해 문장/단어 위치를 캐시해 두고, 사용자 단어장으로 만든
+메모리 집합과 비교해 단어마다 known(학습 완료) / saved(단어장에 있음) / new 를 붙인다.
+페이지당 비용은 단어장 크기와 관계없이 페이지 단어 수에만 비례한다.
+"""
+import re
+import threading
+from collections import OrderedDict
+
+from dictionary import normalize_word, lemma_candidates
+
+# reader.html과 같은 페이지 크기 (글자 수)
+PAGE_SIZE = 1000
+# 캐시할 최대 페이지 수
+MAX_CACHED_PAGES = 2000
+
+SENTENCE_RE = re.compile(r'[^.!?]+[.!?]+|[^.!?]+$')
+TOKEN_RE = re.compile(r"[A-Za-z]+(?:['’-][A-Za-z]+)*")
+
+
+def tokenize_page(text):
+    """페이지 텍스트 → [(문장 시작, 문장 끝, [(단어 시작, 단어 끝, 비교할 표제어 후보), ...]), ...]"""
+    sentences = []
+    for sentence in SENTENCE_RE.finditer(text):
+        if not sentence.group(0).strip():
+            continue
+        tokens = []
+        for token in TOKEN_RE.finditer(text, sentence.start(), sentence.end()):
+            tokens.append((token.start(), token.end(), tuple(lemma_candidates(token.group(0)))))
+        sentences.append((sentence.start(), sentence.end(), tokens))
+    return sentences
+
+
+class PageAnnotator:
+    """페이지 토큰 캐시 + 사용자별 단어장 집합"""
+
+    def __init__(self, db, page_size=PAGE_SIZE, max_pages=MAX_CACHED_PAGES):
+        self.db = db
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self._pages = OrderedDict()
+        self._vocab = {}
+        self._lock = threading.Lock()
+
+    def get_page(self, book_id, page):
+        """(책 제목, 페이지 텍스트, 전체 페이지 수, 토큰) - 처음 요청할 때만 DB에서 읽어 토큰화"""
+        key = (book_id, page)
+        with self._lock:
+            cached = self._pages.get(key)
+            if cached:
+                self._pages.move_to_end(key)
+                return cached
+
+        book = self.db.get_book_text_range(book_id, page * self.page_size, self.page_size)
+        if book is None:
+            raise LookupError('책을 찾을 수 없습니다')
+        total_pages = max(1, -(-book['total_length'] // self.page_size))
+        if page < 0 or page >= total_pages:
+            raise LookupError('페이지를 찾을 수 없습니다')
+        entry = (book['title'], book['text'], total_pages, tokenize_page(book['text']))
+
+        with self._lock:
+            self._pages[key] = entry
+            while len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+        return entry
+
+    def get_vocabulary_status(self, user_id):
+        """사용자 단어장 → {표제어: 'known' | 'saved'}
+
+        다른 워커에서 단어장이 바뀌어도 맞도록 공유 캐시의 단어장 버전과 함께 저장한다.
+        """
+        version = self.db.cache.version('vocabulary')
+        with self._lock:
+            cached = self._vocab.get(user_id)
+        if cached and version is not None and cached[0] == version:
+            return cached[1]
+
+        status = {}
+        for vocab in self.db.get_vocabulary(user_id):
+            word = normalize_word(vocab['word'])
+            if not word:
+                continue
+            if vocab.get('learned'):
+                status[word] = 'known'
+            else:
+                status.setdefault(word, 'saved')
+
+        with self._lock:
+            self._vocab[user_id] = (version, status)
+        return status
+
+    def invalidate_vocabulary(self, user_id):
+        """단어 추가/학습 상태 변경 시 호출"""
+        with self._lock:
+            self._vocab.pop(user_id, None)
+
+    def annotate(self, user_id, book_id, page):
+        """페이지 주석 결과 (문장별 단어 위치와 상태)"""
+        title, text, total_pages, sentences = self.get_page(book_id, page)
+        status = self.get_vocabulary_status(user_id)
+
+        result = []
+        for start, end, tokens in sentences:
+            spans = []
+            for token_start, token_end, candidates in tokens:
+                word_status = 'new'
+                for candidate in candidates:
+                    if candidate in status:
+                        word_status = status[candidate]
+                        break
+                spans.append([token_start, token_end, word_status])
+            result.append({'start': start, 'end': end, 'tokens': spans})
+
+        return {
+            'book_id': book_id,
+            'title': title,
+            'page': page,
+            'total_pages': total_pages,
+            'text': text,
+            'sentences': result,
+        }
@@ -1,31 +1,92 @@
 from flask import Flask, render_template, jsonify, request, send_from_directory
 from flask_cors import CORS
 from database import Database
+from quiz import QuizGenerator
+from dictionary import Dictionary
+from annotation import PageAnnotator
+from progress import ProgressBuffer
+from readability import LEVELS, ensure_practice_sentences_scored, ensure_book_scored, score_book, learner_level
+from profiling import init_profiling
 import requests
 import os
 import json
+import atexit
 
 app = Flask(__name__)
 CORS(app)
+# 요청 단위 프로파일링 (PROFILE_SAMPLE_RATE / PROFILE_TOKEN 설정 시에만)
+init_profiling(app)
 
 # 데이터베이스 초기화
 if not os.path.exists('data'):
     os.makedirs('data')
 db = Database()
+quiz_generator = QuizGenerator(db)
+page_annotator = PageAnnotator(db)
+
+
+# 외부 API 주소 (벤치마크/테스트 시 로컬 서버로 바꿀 수 있음)
+TRANSLATE_API_URL = os.environ.get('TRANSLATE_API_URL', 'https://api.mymemory.translated.net/get')
+GUTENBERG_BASE_URL = os.environ.get('GUTENBERG_BASE_URL', 'https://www.gutenberg.org')
+
+def translation_params(text, src='en', dest='ko'):
+    """MyMemory 번역 요청 파라미터"""
+    return {'q': text, 'langpair': f'{src}|{dest}'}
+
+def translation_cache_key(text, src='en', dest='ko'):
+    """번역 캐시 키"""
+    return f'{src}|{dest}|{text}'
+
+def parse_translation(status_code, data, text):
+    """MyMemory 응답에서 번역문 추출 (실패 시 원문 반환)"""
+    if status_code == 200 and 'responseData' in data:
+        return data['responseData']['translatedText']
+    return text
+
+# 오프라인 영한 사전 (단어 하나짜리 번역은 여기서 먼저 찾음)
+DICTIONARY_PATH = os.environ.get('DICTIONARY_PATH', os.path.join('data', 'en_ko_dictionary.tsv'))
+dictionary = Dictionary.load(DICTIONARY_PATH)
+
+def request_text(data):
+    """요청 JSON의 text 값 → 문자열 (숫자는 문자열로 바꿈, 객체가 아니거나 다른 타입이면 None)"""
+    if not isinstance(data, dict):
+        return None
+    text = data.get('text', '')
+    if isinstance(text, (int, float)) and not isinstance(text, bool):
+        return str(text)
+    return text if isinstance(text, str) else None
+
+def is_single_word(text):
+    """사전에서 찾을 수 있는 단어 하나인지"""
+    if not isinstance(text, str):
+        return False
+    text = text.strip()
+    return bool(text) and len(text) <= 40 and len(text.split()) == 1
+
+def lookup_word(word):
+    """사전에서 단어 찾기 → {'word', 'lemma', 'translation', 'source'} 또는 None"""
+    entry = dictionary.lookup(word)
+    if entry:
+        entry['source'] = 'dictionary'
+    return entry
 
 # 간단한 번역 함수 (MyMemory Translation API 사용)
 def translate_text_api(text, src='en', dest='ko'):
-    """무료 번역 API를 사용한 번역"""
+    """무료 번역 API를 사용한 번역 (결과는 워커 간 공유 캐시에 저장)"""
+    key = translation_cache_key(text, src, dest)
+    cached = db.cache.get('translations', key)
+    if cached is not None:
+        return cached
     try:
-        url = f"https://api.mymemory.translated.net/get?q={text}&langpair={src}|{dest}"
-        response = requests.get(url, timeout=5)
-        data = response.json()
-        if response.status_code == 200 and 'responseData' in data:
-            return data['responseData']['translatedText']
-        return text
+        response = requests.get(TRANSLATE_API_URL, params=translation_params(text, src, dest), timeout=5)
+        translation = parse_translation(response.status_code, response.json(), text)
     except Exception as e:
         print(f"번역 오류: {e}")
         return text
+    # 실패하면 원문이 돌아오므로 그때는 저장하지 않음
+    if translation != text:
+        db.cache.set('translations', key, translation)
+    return translation
 
 # 기본 회화 문장 데이터 (DB 초기화용)
 INITIAL_SENTENCES = [
@@ -86,68 +147,71 @@ def init_practice_sentences():
     csv_files = [
         'english_conversation_sentences_100x3.csv'
     ]
-    
-    # [수정] 무조건 테이블을 비우고 다시 로드 (개발 중 데이터 꼬임 방지)
-    try:
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        cursor.execute('DELETE FROM practice_sentences') # 기존 데이터 삭제
-        conn.commit()
-        conn.close()
-        print("기존 문장 데이터 삭제 완료.")
-    except:
-        pass
+    csv_paths = [os.path.join('data', filename) for filename in csv_files]
+    csv_paths = [path for path in csv_paths if os.path.exists(path)]
+
+    # CSV가 마지막 로드 이후 바뀌지 않았으면 다시 로드하지 않음 (워커 시작 속도)
+    source_signature = json.dumps([
+        [path, os.path.getsize(path), int(os.path.getmtime(path))] for path in csv_paths
+    ])
+    if csv_paths and db.get_meta('practice_sentences_source') == source_signature \
+            and db.get_practice_sentences_count() > 0:
+        print("회화 문장 데이터가 최신 상태입니다.")
+        return
 
-    total_loaded = 0
+    sentences = []
     
-    for filename in csv_files:
-        csv_path = os.path.join('data', filename)
-        if os.path.exists(csv_path):
-            print(f"CSV 파일 발견: {csv_path}")
-            try:
-                with open(csv_path, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    count = 0
-                    for row in reader:
-                        # CSV 컬럼: Level, No, Sentence/English, Korean
-                        english = ""
-                        korean = ""
+    for csv_path in csv_paths:
+        filename = os.path.basename(csv_path)
+        print(f"CSV 파일 발견: {csv_path}")
+        try:
+            with open(csv_path, 'r', encoding='utf-8-sig') as f:
+                reader = csv.DictReader(f)
+                count = 0
+                for row in reader:
+                    # CSV 컬럼: Level, No, Sentence/English, Korean
+                    english = ""
+                    korean = ""
+                    
+                    if 'Sentence' in row: english = row['Sentence']
+                    elif 'English' in row: english = row['English']
+                    
+                    if 'Korean' in row: korean = row['Korean']
+                    
+                    if english:
+                        level_str = row.get('Level', 'Beginner')
                         
-                        if 'Sentence' in row: english = row['Sentence']
-                        elif 'English' in row: english = row['English']
+                        # 난이도 변환
+                        difficulty = 1
+                        if level_str == 'Intermediate': difficulty = 2
+                        elif level_str == 'Advanced': difficulty = 3
                         
-                        if 'Korean' in row: korean = row['Korean']
-                        
-                        if english:
-                            level_str = row.get('Level', 'Beginner')
-                            
-                            # 난이도 변환
-                            difficulty = 1
-                            if level_str == 'Intermediate': difficulty = 2
-                            elif level_str == 'Advanced': difficulty = 3
-                            
-                            # DB에 추가
-                            if db.add_practice_sentence(english, korean, level_str, difficulty):
-                                count += 1
-                    print(f"{filename}에서 {count}개 문장 로드 완료!")
-                    total_loaded += count
-            except Exception as e:
-                print(f"{filename} 로드 중 오류: {e}")
-
-    if total_loaded == 0:
+                        sentences.append((english, korean, level_str, difficulty))
+                        count += 1
+                print(f"{filename}에서 {count}개 문장 로드 완료!")
+        except Exception as e:
+            print(f"{filename} 로드 중 오류: {e}")
+
+    if not sentences:
         # CSV 없으면 기본 데이터 사용
         count = db.get_practice_sentences_count()
         if count == 0:
             print(f"DB에 회화 문장이 없습니다. 기본 문장 {len(INITIAL_SENTENCES)}개를 추가합니다...")
-            for item in INITIAL_SENTENCES:
-                db.add_practice_sentence(item['en'], item['ko'], item['cat'])
+            db.replace_practice_sentences([
+                (item['en'], item['ko'], item['cat'], 1) for item in INITIAL_SENTENCES
+            ])
             print("회화 문장 초기화 완료!")
     else:
-         print(f"총 {total_loaded}개의 문장이 준비되었습니다.")
+        # 기존 데이터를 비우고 한 번에 다시 저장 (개발 중 데이터 꼬임 방지)
+        total_loaded = db.replace_practice_sentences(sentences)
+        db.set_meta('practice_sentences_source', source_signature)
+        print(f"총 {total_loaded}개의 문장이 준비되었습니다.")
 
 # 앱 시작 시 초기화 실행
 with app.app_context():
     init_practice_sentences()
+    # 회화 문장 난이도 단계 (문장이 바뀌었거나 채점 방식이 바뀐 경우에만 다시 계산)
+    ensure_practice_sentences_scored(db)
 
 # Project Gutenberg에서 난이도별 영어 책 목록
 POPULAR_BOOKS = [
@@ -278,39 +342,117 @@ POPULAR_BOOKS = [
     }
 ]
 
+def gutenberg_text_urls(gutenberg_id):
+    """책 본문 URL 목록 (앞의 URL이 404면 다음 URL 시도)"""
+    return [
+        f'{GUTENBERG_BASE_URL}/files/{gutenberg_id}/{gutenberg_id}-0.txt',
+        f'{GUTENBERG_BASE_URL}/cache/epub/{gutenberg_id}/pg{gutenberg_id}.txt',
+    ]
+
+def strip_gutenberg_markers(content):
+    """Project Gutenberg 헤더/푸터 제거"""
+    start_markers = ['*** START OF THIS PROJECT GUTENBERG', '*** START OF THE PROJECT GUTENBERG']
+    end_markers = ['*** END OF THIS PROJECT GUTENBERG', '*** END OF THE PROJECT GUTENBERG']
+    
+    for marker in start_markers:
+        if marker in content:
+            content = content.split(marker)[1]
+            break
+    
+    for marker in end_markers:
+        if marker in content:
+            content = content.split(marker)[0]
+            break
+    
+    return content.strip()
+
 def download_book_from_gutenberg(gutenberg_id):
     """Project Gutenberg에서 책 다운로드"""
     try:
-        url = f'https://www.gutenberg.org/files/{gutenberg_id}/{gutenberg_id}-0.txt'
-        response = requests.get(url, timeout=10)
-        
-        if response.status_code == 404:
-            # 대체 URL 시도
-            url = f'https://www.gutenberg.org/cache/epub/{gutenberg_id}/pg{gutenberg_id}.txt'
+        for url in gutenberg_text_urls(gutenberg_id):
             response = requests.get(url, timeout=10)
+            if response.status_code != 404:
+                break
         
         if response.status_code == 200:
-            content = response.text
-            # Project Gutenberg 헤더/푸터 제거
-            start_markers = ['*** START OF THIS PROJECT GUTENBERG', '*** START OF THE PROJECT GUTENBERG']
-            end_markers = ['*** END OF THIS PROJECT GUTENBERG', '*** END OF THE PROJECT GUTENBERG']
-            
-            for marker in start_markers:
-                if marker in content:
-                    content = content.split(marker)[1]
-                    break
-            
-            for marker in end_markers:
-                if marker in content:
-                    content = content.split(marker)[0]
-                    break
-            
-            return content.strip()
+            return strip_gutenberg_markers(response.text)
         return None
     except Exception as e:
         print(f"책 다운로드 오류: {e}")
         return None
 
+def init_featured_books():
+    """POPULAR_BOOKS를 카탈로그의 추천 도서로 등록 (목록이 바뀐 경우에만)"""
+    signature = json.dumps(POPULAR_BOOKS, sort_keys=True)
+    if db.get_meta('featured_books') != signature:
+        db.set_featured_books(POPULAR_BOOKS)
+        db.set_meta('featured_books', signature)
+
+init_featured_books()
+
+def find_catalog_book(gutenberg_id):
+    """카탈로그에서 책 정보 찾기"""
+    if gutenberg_id is None:
+        return None
+    return db.get_catalog_book(gutenberg_id)
+
+def save_downloaded_book(book_info, content):
+    """다운로드한 책을 DB에 저장하고 배지 수여"""
+    book_data = dict(book_info)
+    book_data['content'] = content
+    book_data['total_chapters'] = content.count('CHAPTER') or 1
+    
+    book_id = db.add_book(book_data)
+    # 게임/리더에서 난이도별로 고를 수 있게 문장 채점
+    score_book(db, book_id)
+    
+    # 첫 책 시작 배지
+    db.award_badge(1, 'start_first_book')
+    return book_id
+
+# 읽은 페이지당 보상
+READING_EXPERIENCE_PER_PAGE = 10
+READING_POINTS_PER_PAGE = 5
+# 퀴즈 정답당 보상
+QUIZ_EXPERIENCE_PER_ANSWER = 20
+QUIZ_POINTS_PER_ANSWER = 10
+
+def award_pages_read(user_id, pages_read):
+    """읽은 페이지 보상 (페이지당 10 exp, 5 포인트) → (레벨업 여부, 연속 학습일)
+
+    보상은 한 트랜잭션이라, 예외가 나면 아무것도 반영되지 않은 것 (버퍼가 다시 시도함)
+    """
+    leveled_up, streak = db.award_activity(
+        user_id,
+        pages_read=pages_read,
+        experience=pages_read * READING_EXPERIENCE_PER_PAGE,
+        points=pages_read * READING_POINTS_PER_PAGE,
+    )
+    # 배지는 보상이 저장된 뒤라 실패해도 다시 시도하지 않음 (다음 활동 때 다시 확인됨)
+    try:
+        award_streak_badges(user_id, streak)
+    except Exception as e:
+        print(f"배지 수여 오류: {e}")
+    return leveled_up, streak
+
+# 읽기 위치 체크포인트와 페이지 보상은 모아서 주기적으로 저장 (종료 시 남은 것 저장)
+progress_buffer = ProgressBuffer(db, on_pages_read=award_pages_read)
+progress_buffer.start()
+atexit.register(progress_buffer.stop)
+
+def record_activity(user_id=1, **activity):
+    """학습 활동 기록 및 연속 학습일 배지 수여"""
+    streak = db.record_activity(user_id, **activity)
+    award_streak_badges(user_id, streak)
+    return streak
+
+def award_streak_badges(user_id, streak):
+    """연속 학습일 배지 수여"""
+    if streak >= 7:
+        db.award_badge(user_id, '7_day_streak')
+    if streak >= 30:
+        db.award_badge(user_id, '30_day_streak')
+
 @app.route('/')
 def index():
     """홈페이지"""
@@ -341,32 +483,22 @@ def get_user_profile():
 
 @app.route('/api/books')
 def get_books():
-    """책 목록 API"""
-    # DB에서 다운로드된 책 목록 가져오기
-    downloaded_books = db.get_all_books()
-    
-    # 다운로드된 책을 맵으로 변환 (gutenberg_id 기준)
-    downloaded_map = {book['gutenberg_id']: book for book in downloaded_books}
-    
-    # 결과 리스트
-    result = []
-    
-    # POPULAR_BOOKS를 순회하면서 상태 병합
-    for book in POPULAR_BOOKS:
-        if book['gutenberg_id'] in downloaded_map:
-            # 이미 다운로드됨 -> DB 정보 사용 (ID 포함)
-            db_book = downloaded_map[book['gutenberg_id']]
-            db_book['is_downloaded'] = True
-            # 난이도 정보가 DB에 없을 수 있으므로 업데이트
-            if 'difficulty' in book:
-                db_book['difficulty'] = book['difficulty']
-            result.append(db_book)
-        else:
-            # 다운로드 안 됨 -> 기본 정보 사용
-            book_info = book.copy()
-            book_info['is_downloaded'] = False
-            result.append(book_info)
-            
+    """추천 도서 + 내려받은 책 목록 API"""
+    return jsonify(db.get_featured_books())
+
+@app.route('/api/catalog')
+def browse_catalog():
+    """카탈로그 목록 API (제목순, after로 다음 페이지)"""
+    limit = max(1, min(request.args.get('limit', 20, type=int), 100))
+    result = db.browse_catalog(
+        author=request.args.get('author'),
+        language=request.args.get('language'),
+        subject=request.args.get('subject'),
+        difficulty=request.args.get('difficulty'),
+        title_prefix=request.args.get('q'),
+        after=request.args.get('after', type=int),
+        limit=limit,
+    )
     return jsonify(result)
 
 @app.route('/api/books/<int:book_id>')
@@ -378,14 +510,79 @@ def get_book(book_id):
     except:
         return jsonify({'error': '책을 찾을 수 없습니다'}), 404
 
+@app.route('/api/books/<int:book_id>/progress', methods=['GET', 'POST'])
+def handle_reading_progress(book_id):
+    """읽기 위치 체크포인트 API (위치는 글자 단위로 저장, 페이지로 주고받음)"""
+    page_size = page_annotator.page_size
+    if request.method == 'GET':
+        progress = progress_buffer.get(1, book_id)
+        if not progress:
+            return jsonify({'book_id': book_id, 'page': 0, 'furthest_page': 0, 'completed': False, 'last_read': None})
+        return jsonify({
+            'book_id': book_id,
+            'page': progress['current_position'] // page_size,
+            'furthest_page': progress['total_read'] // page_size,
+            'completed': progress['completed'],
+            'last_read': progress['last_read'],
+        })
+
+    # 페이지를 넘길 때마다 오므로 메모리에만 기록하고 바로 응답
+    data = request.get_json(silent=True) or {}
+    page = data.get('page')
+    if not isinstance(page, int) or page < 0:
+        return jsonify({'error': '페이지 번호가 올바르지 않습니다'}), 400
+    total_pages = data.get('total_pages')
+    completed = isinstance(total_pages, int) and page >= total_pages - 1
+    # 읽은 페이지 보상도 버퍼에 모았다가 저장할 때 한 번에 반영
+    pages_read = data.get('pages_read', 0)
+    pages_read = max(0, min(pages_read, 1)) if isinstance(pages_read, int) else 0
+    progress_buffer.record(1, book_id, page * page_size, completed=completed, pages_read=pages_read)
+    # 보상은 나중에 저장되지만 양은 정해져 있으므로 바로 알려 줌 (레벨업은 리더가 프로필로 확인)
+    return jsonify({
+        'success': True,
+        'points_earned': pages_read * READING_POINTS_PER_PAGE,
+        'experience_earned': pages_read * READING_EXPERIENCE_PER_PAGE,
+    })
+
+def current_learner_level():
+    """요청의 level 값(1~LEVELS로 제한) 또는 사용자 레벨에 맞는 문장 난이도 단계"""
+    level = request.args.get('level', type=int)
+    if level is not None:
+        return max(1, min(LEVELS, level))
+    return learner_level(db.get_user_profile()['level'])
+
+def sample_book_sentences(book_id, level, count, max_words=None):
+    """책에서 난이도 단계의 문장 추출 (채점 전인 책은 먼저 채점)"""
+    ensure_book_scored(db, book_id)
+    return db.get_book_sentences_by_level(book_id, level, count, max_words)
+
+@app.route('/api/books/<int:book_id>/sentences')
+def get_level_sentences(book_id):
+    """학습자 수준에 맞는 책 문장 API (위치는 글자 단위)"""
+    level = current_learner_level()
+    count = max(1, min(request.args.get('count', 10, type=int), 50))
+    return jsonify({
+        'level': level,
+        'sentences': sample_book_sentences(book_id, level, count),
+        'levels': db.get_book_level_counts(book_id),
+    })
+
+@app.route('/api/books/<int:book_id>/pages/<int:page>')
+def get_annotated_page(book_id, page):
+    """단어별 학습 상태가 표시된 페이지 API"""
+    try:
+        return jsonify(page_annotator.annotate(1, book_id, page))
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 404
+
 @app.route('/api/books/download', methods=['POST'])
 def download_book():
     """책 다운로드 API"""
     data = request.json
     gutenberg_id = data.get('gutenberg_id')
     
-    # POPULAR_BOOKS에서 책 정보 찾기
-    book_info = next((book for book in POPULAR_BOOKS if book['gutenberg_id'] == gutenberg_id), None)
+    # 카탈로그에서 책 정보 찾기
+    book_info = find_catalog_book(gutenberg_id)
     
     if not book_info:
         return jsonify({'error': '책 정보를 찾을 수 없습니다'}), 404
@@ -397,21 +594,21 @@ def download_book():
         return jsonify({'error': '책을 다운로드할 수 없습니다'}), 500
     
     # DB에 저장
-    book_info['content'] = content
-    book_info['total_chapters'] = content.count('CHAPTER') or 1
-    
-    book_id = db.add_book(book_info)
-    
-    # 첫 책 시작 배지
-    db.award_badge(1, 'start_first_book')
+    book_id = save_downloaded_book(book_info, content)
     
     return jsonify({'book_id': book_id, 'success': True})
 
 @app.route('/api/translate', methods=['POST'])
 def translate_text():
     """번역 API"""
-    data = request.json
-    text = data.get('text', '')
+    text = request_text(request.get_json(silent=True))
+    if text is None:
+        return jsonify({'error': 'text는 문자열이어야 합니다'}), 400
+    
+    # 단어 하나면 오프라인 사전 먼저
+    entry = lookup_word(text) if is_single_word(text) else None
+    if entry:
+        return jsonify({'original': text, 'translation': entry['translation']})
     
     try:
         translation = translate_text_api(text)
@@ -422,6 +619,24 @@ def translate_text():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/dictionary/lookup')
+def dictionary_lookup():
+    """단어 뜻 조회 API (사전에 없으면 번역 API 사용)"""
+    word = request.args.get('word', '').strip()
+    if not is_single_word(word):
+        return jsonify({'error': '단어 하나를 입력하세요'}), 400
+    
+    entry = lookup_word(word)
+    if not entry:
+        entry = {'word': word, 'lemma': word, 'translation': translate_text_api(word), 'source': 'api'}
+    return jsonify(entry)
+
+@app.route('/api/dictionary/prefix')
+def dictionary_prefix():
+    """접두어로 시작하는 사전 단어 목록 API"""
+    limit = max(1, min(request.args.get('limit', 10, type=int), 50))
+    return jsonify(dictionary.prefix(request.args.get('q', ''), limit))
+
 @app.route('/api/vocabulary', methods=['GET', 'POST'])
 def handle_vocabulary():
     """단어장 API"""
@@ -432,6 +647,8 @@ def handle_vocabulary():
     elif request.method == 'POST':
         data = request.json
         db.add_vocabulary(1, data)
+        quiz_generator.invalidate(1)
+        page_annotator.invalidate_vocabulary(1)
         
         # 단어 수 체크 및 배지 수여
         vocab_count = len(db.get_vocabulary(1))
@@ -442,29 +659,110 @@ def handle_vocabulary():
         
         # 경험치 추가 (단어당 5 exp)
         leveled_up = db.add_experience(1, 5)
+        record_activity(words_added=1, experience=5)
         
         return jsonify({'success': True, 'leveled_up': leveled_up})
 
+@app.route('/api/vocabulary/<int:vocab_id>', methods=['PATCH'])
+def update_vocabulary(vocab_id):
+    """단어 학습 완료 표시 API (리더에서 'known'으로 표시됨)"""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not isinstance(data.get('learned'), bool):
+        return jsonify({'error': 'learned(true/false)가 필요합니다'}), 400
+    
+    if not db.set_vocabulary_learned(1, vocab_id, data['learned']):
+        return jsonify({'error': '단어를 찾을 수 없습니다'}), 404
+    quiz_generator.invalidate(1)
+    page_annotator.invalidate_vocabulary(1)
+    return jsonify({'success': True, 'learned': data['learned']})
+
+@app.route('/api/quiz/generate')
+def generate_quiz():
+    """단어 퀴즈 생성 API"""
+    num_questions = request.args.get('count', 10, type=int)
+    num_options = request.args.get('options', 4, type=int)
+    num_questions = max(1, min(num_questions, 50))
+    num_options = max(2, min(num_options, 6))
+
+    questions = quiz_generator.generate(1, num_questions, num_options)
+    if not questions:
+        return jsonify({'error': f'퀴즈를 시작하려면 최소 {num_options}개의 단어가 필요합니다.'}), 400
+    return jsonify({'questions': questions})
+
+@app.route('/api/quiz/check', methods=['POST'])
+def check_quiz_answer():
+    """퀴즈 한 문항 채점 API (고른 선택지 → 정답 여부와 정답)"""
+    data = request.get_json(silent=True)
+    graded = quiz_generator.grade(1, [data]) if isinstance(data, dict) else []
+    if not graded:
+        return jsonify({'error': '단어를 찾을 수 없습니다'}), 400
+    return jsonify({'correct': graded[0]['correct'], 'answer': graded[0]['answer']})
+
+@app.route('/api/quiz/results', methods=['POST'])
+def submit_quiz_results():
+    """퀴즈 결과 저장 API (answers: [{'vocabulary_id', 'answer': 고른 선택지}], 서버에서 채점)"""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not isinstance(data.get('answers'), list):
+        return jsonify({'error': '저장할 퀴즈 결과가 없습니다'}), 400
+    answers = quiz_generator.grade(1, data['answers'])
+    if not answers:
+        return jsonify({'error': '저장할 퀴즈 결과가 없습니다'}), 400
+
+    result = db.save_quiz_result(1, answers, data.get('quiz_type', 'vocabulary'), data.get('book_id'))
+    page_annotator.invalidate_vocabulary(1)
+
+    # 만점 퀴즈 10회 배지
+    if result['perfect_count'] >= 10:
+        db.award_badge(1, '10_perfect_quizzes')
+
+    # 경험치/포인트는 퀴즈 활동으로 기록 (읽은 페이지 수에 섞이지 않도록)
+    experience = result['score'] * QUIZ_EXPERIENCE_PER_ANSWER
+    points = result['score'] * QUIZ_POINTS_PER_ANSWER
+    leveled_up, streak = db.award_activity(1, quizzes_taken=1, quiz_score=result['score'],
+                                           experience=experience, points=points)
+    award_streak_badges(1, streak)
+
+    return jsonify({
+        'success': True,
+        **result,
+        'leveled_up': leveled_up,
+        'experience_earned': experience,
+        'points_earned': points,
+    })
+
 @app.route('/api/progress', methods=['POST'])
 def update_progress():
     """읽기 진도 업데이트 API"""
     data = request.json
     pages_read = data.get('pages_read', 1)
     
-    # 경험치 추가 (페이지당 10 exp)
-    leveled_up = db.add_experience(1, pages_read * 10)
-    
-    # 포인트 추가
-    profile = db.get_user_profile()
-    new_points = profile['points'] + (pages_read * 5)
-    db.update_user_profile(1, points=new_points)
+    # 경험치/포인트 추가 (리더는 /api/books/<id>/progress로 모아서 반영)
+    leveled_up, streak = award_pages_read(1, pages_read)
     
     return jsonify({
         'success': True,
         'leveled_up': leveled_up,
-        'points_earned': pages_read * 5
+        'points_earned': pages_read * READING_POINTS_PER_PAGE,
+        'streak_days': streak
     })
 
+@app.route('/api/activity')
+def get_activity():
+    """최근 학습 활동 API"""
+    days = max(1, min(request.args.get('days', 30, type=int), 365))
+    return jsonify(db.get_daily_activity(1, days))
+
+@app.route('/api/leaderboard')
+def get_leaderboard():
+    """리더보드 API (by: points/experience/streak, period: all/week)"""
+    order_by = request.args.get('by', 'points')
+    period = request.args.get('period', 'all')
+    limit = max(1, min(request.args.get('limit', 10, type=int), 100))
+    try:
+        return jsonify(db.get_leaderboard(order_by, period, limit))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
 @app.route('/game/<int:book_id>')
 def game(book_id):
     """단어 갤러그 게임 페이지"""
@@ -475,13 +773,35 @@ def game_practice():
     """회화 연습 게임 페이지"""
     return render_template('game.html', book_id=0)  # 0은 연습 모드
 
+def extract_game_sentences(book_id):
+    """게임에 쓸 적당한 길이의 문장 목록"""
+    book = db.get_book(book_id)
+    content = book['content']
+    
+    # 문장 추출 (간단한 정규식 사용)
+    import re
+    sentences = re.split(r'[.!?]+', content)
+    
+    # 적당한 길이의 문장만 필터링 (단어 3개 이상 10개 이하)
+    valid_sentences = []
+    for s in sentences:
+        s = s.strip()
+        words = s.split()
+        if 3 <= len(words) <= 10:
+            valid_sentences.append(s)
+    return valid_sentences
+
 @app.route('/api/game/sentences/<int:book_id>')
 def get_game_sentences(book_id):
     """게임용 문장 추출"""
     # book_id가 0이면 회화 연습 모드
     if book_id == 0:
-        # DB에서 랜덤 문장 10개 가져오기
-        sentences = db.get_random_practice_sentences(10)
+        # 학습자 수준의 문장 10개 (부족하면 랜덤 문장으로 채움)
+        sentences = db.get_practice_sentences_by_level(current_learner_level(), 10)
+        if len(sentences) < 10:
+            chosen = {s['english'] for s in sentences}
+            sentences += [s for s in db.get_random_practice_sentences(10)
+                          if s['english'] not in chosen][:10 - len(sentences)]
         # 클라이언트에 맞게 변환 (영어 리스트 or 딕셔너리 리스트)
         # 기존 클라이언트가 문자열 리스트를 기대하는지 확인 필요
         # game.js의 createEnemies 함수를 보면 response가 바로 사용됨
@@ -515,20 +835,13 @@ def get_game_sentences(book_id):
         return jsonify([s['english'] for s in sentences])
 
     try:
-        book = db.get_book(book_id)
-        content = book['content']
-        
-        # 문장 추출 (간단한 정규식 사용)
-        import re
-        sentences = re.split(r'[.!?]+', content)
-        
-        # 적당한 길이의 문장만 필터링 (단어 3개 이상 10개 이하)
-        valid_sentences = []
-        for s in sentences:
-            s = s.strip()
-            words = s.split()
-            if 3 <= len(words) <= 10:
-                valid_sentences.append(s)
+        # 학습자 수준의 짧은 문장 (단계별 인덱스에서 바로 추출)
+        selected = [s['text'] for s in sample_book_sentences(book_id, current_learner_level(), 5, max_words=10)]
+        if len(selected) >= 5:
+            return jsonify(selected)
+
+        # 해당 단계 문장이 부족하면 책 전체에서 고름 (책마다 한 번만 추출해 공유 캐시에 저장)
+        valid_sentences = db.cache.get_or_set('sentences', book_id, lambda: extract_game_sentences(book_id))
         
         # 랜덤으로 5개 선택
         import random
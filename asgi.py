@@ -0,0 +1,213 @@
+"""비동기(ASGI) 서빙 모드
+
+외부 HTTP를 기다리는 라우트(/api/translate, /api/books/download)는 여기서
+비동기로 처리하고, 나머지 라우트는 기존 Flask 앱으로 넘긴다.
+
+실행:
+    uvicorn asgi:app
+    gunicorn -k uvicorn.workers.UvicornWorker asgi:app
+"""
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+from a2wsgi import WSGIMiddleware
+
+from app import (
+    app as flask_app,
+    db,
+    TRANSLATE_API_URL,
+    translation_cache_key,
+    translation_params,
+    parse_translation,
+    gutenberg_text_urls,
+    strip_gutenberg_markers,
+    find_catalog_book,
+    progress_buffer,
+    is_single_word,
+    lookup_word,
+    request_text,
+    save_downloaded_book,
+)
+
+# SQLite 접근용 스레드 수 (동시 쓰기가 많아도 DB 연결 수가 제한되도록)
+DB_EXECUTOR_WORKERS = int(os.environ.get('DB_EXECUTOR_WORKERS', 4))
+# Flask(WSGI) 라우트를 처리할 스레드 수
+WSGI_WORKERS = int(os.environ.get('WSGI_WORKERS', 10))
+# 외부 API 연결 풀 크기
+HTTP_MAX_CONNECTIONS = int(os.environ.get('HTTP_MAX_CONNECTIONS', 100))
+
+TRANSLATE_TIMEOUT = httpx.Timeout(5.0, connect=3.0)
+DOWNLOAD_TIMEOUT = httpx.Timeout(10.0, connect=3.0)
+
+db_executor = ThreadPoolExecutor(max_workers=DB_EXECUTOR_WORKERS, thread_name_prefix='db')
+wsgi_app = WSGIMiddleware(flask_app, workers=WSGI_WORKERS)
+http_client = None
+
+
+def get_http_client():
+    """공유 비동기 HTTP 클라이언트 (연결 풀 재사용)"""
+    global http_client
+    if http_client is None:
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_CONNECTIONS // 5,
+            ),
+            timeout=DOWNLOAD_TIMEOUT,
+            follow_redirects=True,
+        )
+    return http_client
+
+
+async def close_http_client():
+    global http_client
+    if http_client is not None:
+        await http_client.aclose()
+        http_client = None
+
+
+async def run_db(func, *args):
+    """DB 작업을 제한된 스레드 풀에서 실행"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(db_executor, func, *args)
+
+
+async def translate_text_async(text, src='en', dest='ko'):
+    """비동기 번역 (translate_text_api와 같은 동작, 같은 공유 캐시 사용)"""
+    key = translation_cache_key(text, src, dest)
+    cached = await run_db(db.cache.get, 'translations', key)
+    if cached is not None:
+        return cached
+    try:
+        response = await get_http_client().get(
+            TRANSLATE_API_URL, params=translation_params(text, src, dest), timeout=TRANSLATE_TIMEOUT
+        )
+        translation = parse_translation(response.status_code, response.json(), text)
+    except Exception as e:
+        print(f"번역 오류: {e}")
+        return text
+    if translation != text:
+        await run_db(db.cache.set, 'translations', key, translation)
+    return translation
+
+
+async def download_book_async(gutenberg_id):
+    """비동기 책 다운로드 (download_book_from_gutenberg와 같은 동작)"""
+    try:
+        client = get_http_client()
+        for url in gutenberg_text_urls(gutenberg_id):
+            response = await client.get(url)
+            if response.status_code != 404:
+                break
+
+        if response.status_code == 200:
+            return strip_gutenberg_markers(response.text)
+        return None
+    except Exception as e:
+        print(f"책 다운로드 오류: {e}")
+        return None
+
+
+async def read_json(receive):
+    body = b''
+    more_body = True
+    while more_body:
+        message = await receive()
+        body += message.get('body', b'')
+        more_body = message.get('more_body', False)
+    try:
+        return json.loads(body or b'{}')
+    except ValueError:
+        return None
+
+
+async def send_json(send, data, status=200):
+    body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode()),
+            (b'access-control-allow-origin', b'*'),
+        ],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def handle_translate(scope, receive, send):
+    """번역 API"""
+    text = request_text(await read_json(receive))
+    if text is None:
+        await send_json(send, {'error': 'text는 문자열이어야 합니다'}, 400)
+        return
+
+    # 단어 하나면 오프라인 사전 먼저 (메모리 조회라 이벤트 루프에서 바로 처리)
+    entry = lookup_word(text) if is_single_word(text) else None
+    if entry:
+        await send_json(send, {'original': text, 'translation': entry['translation']})
+        return
+
+    translation = await translate_text_async(text)
+    await send_json(send, {'original': text, 'translation': translation})
+
+
+async def handle_download(scope, receive, send):
+    """책 다운로드 API"""
+    data = await read_json(receive)
+    if not isinstance(data, dict):
+        await send_json(send, {'error': '잘못된 요청입니다'}, 400)
+        return
+    gutenberg_id = data.get('gutenberg_id')
+
+    book_info = await run_db(find_catalog_book, gutenberg_id)
+    if not book_info:
+        await send_json(send, {'error': '책 정보를 찾을 수 없습니다'}, 404)
+        return
+
+    content = await download_book_async(gutenberg_id)
+    if not content:
+        await send_json(send, {'error': '책을 다운로드할 수 없습니다'}, 500)
+        return
+
+    book_id = await run_db(save_downloaded_book, book_info, content)
+    await send_json(send, {'book_id': book_id, 'success': True})
+
+
+# 비동기로 처리하는 라우트 (method, path) -> handler
+ASYNC_ROUTES = {
+    ('POST', '/api/translate'): handle_translate,
+    ('POST', '/api/books/download'): handle_download,
+}
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            get_http_client()
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await close_http_client()
+            # 모아 둔 읽기 체크포인트 저장
+            await run_db(progress_buffer.stop)
+            db_executor.shutdown(wait=True)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+        return
+
+    if scope['type'] == 'http':
+        handler = ASYNC_ROUTES.get((scope['method'], scope['path']))
+        if handler:
+            await handler(scope, receive, send)
+            return
+
+    await wsgi_app(scope, receive, send)
@@ -0,0 +1,162 @@
+"""동기(WSGI) vs 비동기(ASGI) 서빙 처리량 비교 벤치마크
+
+MyMemory/Gutenberg 대신 응답을 일부러 늦게 주는 로컬 서버를 띄우고,
+같은 수의 동시 요청을 두 모드로 보내 초당 처리량을 비교한다.
+번역 캐시에 걸리지 않도록 모드마다 다른 문장을 보내고, 외부 API 호출 수도 함께 출력한다.
+
+실행:
+    python bench_async.py [--requests 200] [--concurrency 50] [--delay 0.2] [--sync-workers 4]
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BOOK_TEXT = (
+    '*** START OF THE PROJECT GUTENBERG EBOOK ***\n'
+    + 'CHAPTER I\nOnce upon a time there was a little rabbit. ' * 200
+    + '\n*** END OF THE PROJECT GUTENBERG EBOOK ***'
+)
+
+
+class StandInUpstream(BaseHTTPRequestHandler):
+    """느린 외부 API 흉내 (delay초 후 응답)"""
+    protocol_version = 'HTTP/1.1'
+    delay = 0.2
+    hits = 0
+    hits_lock = threading.Lock()
+
+    def do_GET(self):
+        with StandInUpstream.hits_lock:
+            StandInUpstream.hits += 1
+        time.sleep(self.delay)
+        if self.path.startswith('/get'):
+            body = json.dumps({'responseData': {'translatedText': '번역'}}).encode('utf-8')
+            content_type = 'application/json'
+        else:
+            body = BOOK_TEXT.encode('utf-8')
+            content_type = 'text/plain; charset=utf-8'
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+
+def start_upstream(delay):
+    StandInUpstream.delay = delay
+    server = StandInServer(('127.0.0.1', 0), StandInUpstream)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def make_payloads(total, tag):
+    """번역 요청 위주에 책 다운로드를 섞은 요청 목록 (tag: 모드마다 다른 문장을 쓰기 위한 접두어)"""
+    payloads = []
+    for i in range(total):
+        if i % 10 == 0:
+            payloads.append(('/api/books/download', {'gutenberg_id': 21}))
+        else:
+            payloads.append(('/api/translate', {'text': f'{tag} hello {i}'}))
+    return payloads
+
+
+def bench_sync(flask_app, payloads, workers):
+    """gunicorn sync 워커 N개를 스레드 N개로 흉내"""
+    def call(item):
+        path, body = item
+        with flask_app.test_client() as client:
+            return client.post(path, json=body).status_code
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        statuses = list(pool.map(call, payloads))
+    return time.perf_counter() - start, statuses
+
+
+async def bench_async(asgi_app, payloads, concurrency):
+    import httpx
+
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=asgi_app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+        async def call(item):
+            path, body = item
+            async with semaphore:
+                response = await client.post(path, json=body)
+                return response.status_code
+
+        start = time.perf_counter()
+        statuses = await asyncio.gather(*(call(item) for item in payloads))
+        elapsed = time.perf_counter() - start
+    return elapsed, statuses
+
+
+def report(name, elapsed, statuses, upstream_hits):
+    ok = sum(1 for s in statuses if s == 200)
+    print(f'{name:<28} {elapsed:7.2f}s  {len(statuses) / elapsed:8.1f} req/s  '
+          f'({ok}/{len(statuses)} OK, 외부 API {upstream_hits}회)')
+
+
+def run_phase(name, bench):
+    """bench() → (경과 시간, 상태 코드 목록), 그동안의 외부 API 호출 수와 함께 출력"""
+    hits = StandInUpstream.hits
+    elapsed, statuses = bench()
+    report(name, elapsed, statuses, StandInUpstream.hits - hits)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--delay', type=float, default=0.2, help='가짜 외부 API 응답 지연 (초)')
+    parser.add_argument('--sync-workers', type=int, default=4, help='비교할 gunicorn sync 워커 수')
+    args = parser.parse_args()
+
+    upstream = start_upstream(args.delay)
+    upstream_url = f'http://127.0.0.1:{upstream.server_address[1]}'
+    os.environ['TRANSLATE_API_URL'] = f'{upstream_url}/get'
+    os.environ['GUTENBERG_BASE_URL'] = upstream_url
+    # 디스크 캐시(cache.db)가 남아 다음 실행/모드의 결과를 바꾸지 않도록 프로세스 내부 캐시 사용
+    os.environ['CACHE_BACKEND'] = 'memory'
+
+    # 실제 DB를 건드리지 않도록 임시 디렉터리에서 실행
+    workdir = tempfile.mkdtemp(prefix='bench_async_')
+    os.makedirs(os.path.join(workdir, 'data'))
+    os.chdir(workdir)
+    sys.path.insert(0, BASE_DIR)
+
+    try:
+        import asgi
+
+        print(f'요청 {args.requests}개, 외부 API 지연 {args.delay}s')
+        sync_payloads = make_payloads(args.requests, 'sync')
+        run_phase(f'sync  (workers={args.sync_workers})',
+                  lambda: bench_sync(asgi.flask_app, sync_payloads, args.sync_workers))
+        async_payloads = make_payloads(args.requests, 'async')
+        run_phase(f'async (concurrency={args.concurrency})',
+                  lambda: asyncio.run(bench_async(asgi.app, async_payloads, args.concurrency)))
+    finally:
+        upstream.shutdown()
+        os.chdir(BASE_DIR)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
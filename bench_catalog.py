@@ -0,0 +1,92 @@
+"""카탈로그 목록/검색 응답 시간 측정
+
+가짜 Gutenberg 카탈로그 CSV를 만들어 15권 / 7만 권으로 각각 불러온 뒤,
+같은 목록/필터/검색 조회의 평균 시간을 비교한다.
+
+실행:
+    python bench_catalog.py [--sizes 15 70000] [--repeat 200]
+"""
+import argparse
+import csv
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from catalog import load_gutenberg_catalog
+from database import Database
+
+WORDS = ['garden', 'secret', 'island', 'river', 'king', 'little', 'house', 'night', 'war', 'journey',
+         'mystery', 'ship', 'forest', 'girl', 'boy', 'city', 'letters', 'voyage', 'tale', 'history']
+SUBJECTS = ['Fiction', 'Juvenile fiction', 'Poetry', 'Adventure stories', 'Philosophy', 'History',
+            'Fairy tales', 'Science fiction', 'Love stories', 'Detective and mystery stories']
+LANGUAGES = ['en', 'en', 'en', 'fr', 'de']
+
+QUERIES = {
+    '전체 첫 페이지': {},
+    '제목 접두어': {'title_prefix': 'secret'},
+    '언어': {'language': 'en'},
+    '주제': {'subject': 'poetry'},
+    '난이도': {'difficulty': 'beginner'},
+    '저자': {'author': 'Author 17,'},
+}
+
+
+def write_fake_catalog(path, size, rng):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Text#', 'Type', 'Issued', 'Title', 'Language', 'Authors', 'Subjects', 'LoCC', 'Bookshelves'])
+        for i in range(1, size + 1):
+            title = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(2, 5))).title()
+            writer.writerow([
+                i, 'Text', '2000-01-01', f'The {title}', rng.choice(LANGUAGES),
+                f'Author {rng.randint(1, size // 3 + 1)}, Some',
+                '; '.join(rng.sample(SUBJECTS, 2)), 'PR', '',
+            ])
+
+
+def time_query(db, repeat, **filters):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = db.browse_catalog(limit=20, **filters)
+    # 마지막 페이지 근처까지 이어서 조회하는 경우도 같은 비용인지 확인
+    after = result['next_after']
+    deep_start = time.perf_counter()
+    for _ in range(repeat):
+        db.browse_catalog(limit=20, after=after, **filters)
+    end = time.perf_counter()
+    return (deep_start - start) / repeat * 1000, (end - deep_start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[15, 70000])
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    workdir = tempfile.mkdtemp(prefix='bench_catalog_')
+    try:
+        results = {}
+        for size in args.sizes:
+            csv_path = os.path.join(workdir, f'catalog_{size}.csv')
+            write_fake_catalog(csv_path, size, rng)
+            db = Database(os.path.join(workdir, f'catalog_{size}.db'))
+
+            start = time.perf_counter()
+            load_gutenberg_catalog(db, csv_path)
+            print(f'{size}권 불러오기: {time.perf_counter() - start:.2f}s')
+
+            results[size] = {name: time_query(db, args.repeat, **filters) for name, filters in QUERIES.items()}
+
+        print(f'\n{"조회":<12}' + ''.join(f'{size:>16}권' for size in args.sizes) + '   (첫 페이지 / 다음 페이지, ms)')
+        for name in QUERIES:
+            row = ''.join(f'{results[size][name][0]:>8.3f} /{results[size][name][1]:>7.3f}' for size in args.sizes)
+            print(f'{name:<12}{row}')
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""문장 난이도 일괄 채점 시간 측정
+
+가짜 문장 N개(기본 10만 개)를 만들어, 단어가 나올 때마다 특징을 다시 계산하는 방식과
+readability.SentenceBatch(서로 다른 단어마다 한 번만 계산)를 비교하고, DB 저장까지의 시간을 잰다.
+두 방식은 같은 특징(글자 수/음절/희귀도)으로 같은 점수를 낸다.
+
+실행:
+    python bench_readability.py [--sentences 100000]
+"""
+import argparse
+import math
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from database import Database
+from collections import Counter
+
+from readability import (
+    SentenceBatch, WORD_RE, assign_levels, count_syllables, score_practice_sentences, sentence_score,
+)
+
+WORDS = ['the', 'a', 'i', 'you', 'is', 'was', 'to', 'and', 'of', 'in', 'it', 'that', 'garden', 'secret',
+         'island', 'river', 'king', 'little', 'house', 'night', 'journey', 'mystery', 'forest',
+         'extraordinary', 'consideration', 'unfortunately', 'institutional', 'recommendation',
+         'beautiful', 'remember', 'yesterday', 'quickly', 'wonderful', 'conversation', 'umbrella']
+
+
+def make_sentences(count, rng):
+    sentences = []
+    for _ in range(count):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(2, 25))]
+        # 희귀 단어가 섞이도록 가끔 새 단어를 만듦
+        if rng.random() < 0.3:
+            words.append(''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(4, 12))))
+        sentences.append(' '.join(words).capitalize() + '.')
+    return sentences
+
+
+def score_one_by_one(sentences):
+    """비교용: 단어가 나올 때마다 음절/희귀도를 다시 계산하는 방식 (SentenceBatch.scores와 같은 점수)"""
+    tokenized = [WORD_RE.findall(text.lower()) for text in sentences]
+    counts = Counter(word for words in tokenized for word in words)
+    ranks = {word: rank for rank, (word, _) in enumerate(counts.most_common(), start=1)}
+    log_scale = math.log2(len(ranks) + 3)
+
+    scores = []
+    for words in tokenized:
+        syllables = sum(count_syllables(w) for w in words)
+        rarity = sum(math.log2(ranks[w] + 1) / log_scale for w in words)
+        letters = sum(len(w) for w in words)
+        scores.append(sentence_score(len(words), syllables, rarity, letters))
+    return scores
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sentences', type=int, default=100000)
+    args = parser.parse_args()
+
+    sentences = make_sentences(args.sentences, random.Random(42))
+
+    start = time.perf_counter()
+    baseline = score_one_by_one(sentences)
+    one_by_one = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = SentenceBatch(sentences)
+    scores = batch.scores()
+    batched = time.perf_counter() - start
+    levels, _ = assign_levels(scores)
+    assert all(abs(a - b) < 1e-6 for a, b in zip(baseline, scores))
+
+    workdir = tempfile.mkdtemp(prefix='bench_readability_')
+    try:
+        db = Database(os.path.join(workdir, 'readability.db'))
+        db.replace_practice_sentences([(text, '', 'bench', 1) for text in sentences])
+        start = time.perf_counter()
+        score_practice_sentences(db)
+        with_db = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(1000):
+            db.get_practice_sentences_by_level(3, 10)
+        lookup = (time.perf_counter() - start) / 1000 * 1000
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f'문장 {len(sentences)}개 (서로 다른 단어 {len(batch.word_features())}개)')
+    print(f'단어마다 다시 계산:   {one_by_one:.2f}s')
+    print(f'단어별 한 번만 계산:  {batched:.2f}s')
+    print(f'DB 읽기/채점/저장:  {with_db:.2f}s')
+    print(f'단계별 문장 10개 조회: {lookup:.3f}ms')
+    print('단계별 문장 수:', {level: list(levels).count(level) for level in sorted(set(levels))})
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""DB 초기화(마이그레이션) 시작 시간 측정
+
+새 DB에 모든 마이그레이션을 적용하는 시간과, 이미 최신인 DB를 여는 시간
+(다른 워커 프로세스가 시작할 때의 비용)을 비교한다.
+
+실행:
+    python bench_startup.py [--repeat 50]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import database
+from database import Database, SCHEMA_VERSION
+
+
+def open_fresh_process(db_path):
+    """새 워커 프로세스처럼 프로세스 내 마이그레이션 캐시 없이 DB 열기"""
+    Database._migrated.clear()
+    start = time.perf_counter()
+    Database(db_path)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench_startup_')
+    try:
+        fresh_times = []
+        for i in range(args.repeat):
+            fresh_times.append(open_fresh_process(os.path.join(workdir, f'fresh_{i}.db')))
+
+        db_path = os.path.join(workdir, 'current.db')
+        Database(db_path)
+        current_times = [open_fresh_process(db_path) for _ in range(args.repeat)]
+
+        cached_start = time.perf_counter()
+        for _ in range(args.repeat):
+            Database(db_path)
+        cached_time = (time.perf_counter() - cached_start) / args.repeat
+
+        print(f'스키마 버전 {SCHEMA_VERSION} (마이그레이션 {len(database.MIGRATIONS)}개)')
+        print(f'새 DB 마이그레이션        {sum(fresh_times) / len(fresh_times) * 1000:8.3f} ms')
+        print(f'최신 DB 열기 (새 프로세스) {sum(current_times) / len(current_times) * 1000:8.3f} ms')
+        print(f'최신 DB 열기 (같은 프로세스) {cached_time * 1000:8.3f} ms')
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,342 @@
+"""워커 간 공유 캐시
+
+gunicorn 워커마다 따로 캐시를 두면 같은 데이터를 여러 번 만들고, 한 워커에서
+데이터를 바꿔도 다른 워커의 캐시는 그대로 남는다. 여기서는 네임스페이스별
+버전 번호로 캐시를 무효화하고, 기본 저장소는 모든 워커가 함께 쓰는 SQLite 파일이다.
+
+- 값을 쓰는 쪽은 데이터를 바꾼 뒤 invalidate(namespace)로 버전을 올린다.
+- 읽는 쪽은 값을 만들기 전에 버전을 읽어 두고 그 버전으로 저장하므로,
+  도중에 무효화되면 오래된 값은 다시 읽히지 않는다.
+- 네임스페이스마다 최대 항목 수를 넘으면 가장 오래 안 쓴 항목부터 지운다.
+- 버전은 줄어들지 않는다. 캐시를 비울 때도 모든 네임스페이스의 버전을 올리므로,
+  버전 번호로 로컬 사본을 들고 있는 쪽(퀴즈/페이지 주석)도 옛 값을 쓰지 않는다.
+- 캐시 파일은 DB 파일과 따로 있으므로, 시작할 때 DB 세대(app_meta의 id + 파일)와
+  캐시에 기록된 세대가 다르면(DB를 되돌렸거나 바꾼 경우) 캐시를 모두 비운다.
+  확인과 기록은 한 트랜잭션이라 워커 여러 개가 동시에 시작해도 한 번만 비운다.
+
+저장소는 CACHE_BACKEND 환경 변수로 고른다: sqlite(기본) / memory(프로세스 내부).
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+# 네임스페이스별 최대 항목 수
+NAMESPACE_LIMITS = {
+    'profile': 100,
+    'books': 200,
+    'vocabulary': 200,
+    'translations': 5000,
+    'sentences': 100,
+}
+DEFAULT_LIMIT = 1000
+
+
+class CacheBackend(ABC):
+    """캐시 저장소 인터페이스 (다른 저장소를 붙일 때 이 메서드들을 구현)"""
+
+    @abstractmethod
+    def get_version(self, namespace):
+        """네임스페이스의 현재 버전 (없으면 0)"""
+
+    @abstractmethod
+    def bump_version(self, namespace):
+        """버전을 올리고 그 네임스페이스 항목을 지움 → 새 버전"""
+
+    @abstractmethod
+    def get(self, namespace, key, version):
+        """(찾음 여부, 값)"""
+
+    @abstractmethod
+    def set(self, namespace, key, version, value, max_entries):
+        """현재 버전이 version일 때만 저장"""
+
+    @abstractmethod
+    def clear(self):
+        """모든 항목 삭제 (버전은 지우지 않고 모든 네임스페이스를 한 단계 올림)"""
+
+    @abstractmethod
+    def bind_generation(self, generation):
+        """캐시에 기록된 DB 세대가 generation과 다르면 비우고 기록 (한 번에) → 비웠으면 True"""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """프로세스 내부 저장소 (워커 하나로 실행할 때/테스트용)"""
+
+    def __init__(self):
+        self._versions = {}
+        self._entries = {}
+        self._generation = None
+        self._lock = threading.Lock()
+
+    def get_version(self, namespace):
+        with self._lock:
+            return self._versions.get(namespace, 0)
+
+    def bump_version(self, namespace):
+        with self._lock:
+            self._versions[namespace] = self._versions.get(namespace, 0) + 1
+            self._entries.pop(namespace, None)
+            return self._versions[namespace]
+
+    def get(self, namespace, key, version):
+        with self._lock:
+            entries = self._entries.get(namespace)
+            if entries is None or key not in entries:
+                return False, None
+            entry_version, value = entries[key]
+            if entry_version != version:
+                return False, None
+            entries.move_to_end(key)
+            return True, json.loads(value)
+
+    def set(self, namespace, key, version, value, max_entries):
+        with self._lock:
+            if version != self._versions.get(namespace, 0):
+                return
+            entries = self._entries.setdefault(namespace, OrderedDict())
+            # SQLite 저장소와 같게 직렬화해서 저장 (호출한 쪽이 값을 고쳐도 캐시는 그대로)
+            entries[key] = (version, json.dumps(value, ensure_ascii=False))
+            entries.move_to_end(key)
+            while len(entries) > max_entries:
+                entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._clear()
+
+    def _clear(self):
+        for namespace in set(self._versions) | set(NAMESPACE_LIMITS):
+            self._versions[namespace] = self._versions.get(namespace, 0) + 1
+        self._entries.clear()
+
+    def bind_generation(self, generation):
+        with self._lock:
+            if self._generation == generation:
+                return False
+            self._clear()
+            self._generation = generation
+            return True
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """여러 워커 프로세스가 함께 쓰는 SQLite 파일 저장소"""
+
+    # 조회할 때마다 쓰지 않도록, 마지막 사용 시각은 이 간격(초)보다 오래됐을 때만 갱신
+    TOUCH_INTERVAL = 30
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        conn = self._connection()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS cache_versions (
+                namespace TEXT PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                version INTEGER NOT NULL,
+                value TEXT NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_cache_entries_lru ON cache_entries (namespace, last_access)')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS cache_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        ''')
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode = WAL')
+            conn.execute('PRAGMA synchronous = NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get_version(self, namespace):
+        row = self._connection().execute(
+            'SELECT version FROM cache_versions WHERE namespace = ?', (namespace,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def bump_version(self, namespace):
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('''
+                INSERT INTO cache_versions (namespace, version) VALUES (?, 1)
+                ON CONFLICT (namespace) DO UPDATE SET version = version + 1
+            ''', (namespace,))
+            conn.execute('DELETE FROM cache_entries WHERE namespace = ?', (namespace,))
+            version = self.get_version(namespace)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return version
+
+    def get(self, namespace, key, version):
+        conn = self._connection()
+        row = conn.execute('''
+            SELECT value, last_access FROM cache_entries
+            WHERE namespace = ? AND key = ? AND version = ?
+        ''', (namespace, key, version)).fetchone()
+        if not row:
+            return False, None
+
+        now = time.time()
+        if now - row[1] > self.TOUCH_INTERVAL:
+            conn.execute('''
+                UPDATE cache_entries SET last_access = ? WHERE namespace = ? AND key = ?
+            ''', (now, namespace, key))
+        return True, json.loads(row[0])
+
+    def set(self, namespace, key, version, value, max_entries):
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            # 값을 만드는 사이 무효화됐으면 저장하지 않음
+            if version == self.get_version(namespace):
+                conn.execute('''
+                    INSERT OR REPLACE INTO cache_entries (namespace, key, version, value, last_access)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (namespace, key, version, json.dumps(value, ensure_ascii=False), time.time()))
+
+                count = conn.execute(
+                    'SELECT COUNT(*) FROM cache_entries WHERE namespace = ?', (namespace,)
+                ).fetchone()[0]
+                if count > max_entries:
+                    conn.execute('''
+                        DELETE FROM cache_entries WHERE rowid IN (
+                            SELECT rowid FROM cache_entries WHERE namespace = ?
+                            ORDER BY last_access LIMIT ?
+                        )
+                    ''', (namespace, count - max_entries))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def clear(self):
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            self._clear(conn)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def _clear(self, conn):
+        # 버전을 0으로 되돌리면 다른 워커가 이미 가진 버전 번호와 겹칠 수 있으므로 올리기만 함
+        conn.executemany('INSERT OR IGNORE INTO cache_versions (namespace, version) VALUES (?, 0)',
+                         [(namespace,) for namespace in NAMESPACE_LIMITS])
+        conn.execute('UPDATE cache_versions SET version = version + 1')
+        conn.execute('DELETE FROM cache_entries')
+
+    def bind_generation(self, generation):
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute("SELECT value FROM cache_meta WHERE key = 'generation'").fetchone()
+            cleared = not row or row[0] != generation
+            if cleared:
+                self._clear(conn)
+                conn.execute('''
+                    INSERT INTO cache_meta (key, value) VALUES ('generation', ?)
+                    ON CONFLICT (key) DO UPDATE SET value = excluded.value
+                ''', (generation,))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return cleared
+
+
+class SharedCache:
+    """네임스페이스/버전 단위 캐시 (저장소 오류는 캐시 미스로 처리)"""
+
+    def __init__(self, backend, limits=None):
+        self.backend = backend
+        self.limits = dict(NAMESPACE_LIMITS, **(limits or {}))
+
+    def version(self, namespace):
+        """네임스페이스의 현재 버전 (로컬 캐시가 최신인지 확인할 때 사용)"""
+        try:
+            return self.backend.get_version(namespace)
+        except Exception as e:
+            print(f"캐시 오류: {e}")
+            return None
+
+    def get(self, namespace, key):
+        version = self.version(namespace)
+        if version is None:
+            return None
+        try:
+            found, value = self.backend.get(namespace, str(key), version)
+            return value if found else None
+        except Exception as e:
+            print(f"캐시 오류: {e}")
+            return None
+
+    def set(self, namespace, key, value, version=None):
+        if version is None:
+            version = self.version(namespace)
+            if version is None:
+                return
+        try:
+            self.backend.set(namespace, str(key), version, value,
+                             self.limits.get(namespace, DEFAULT_LIMIT))
+        except Exception as e:
+            print(f"캐시 오류: {e}")
+
+    def get_or_set(self, namespace, key, loader):
+        """캐시에 없으면 loader()로 만들어 저장"""
+        version = self.version(namespace)
+        if version is None:
+            return loader()
+        try:
+            found, value = self.backend.get(namespace, str(key), version)
+            if found:
+                return value
+        except Exception as e:
+            print(f"캐시 오류: {e}")
+
+        value = loader()
+        self.set(namespace, key, value, version)
+        return value
+
+    def invalidate(self, namespace):
+        """데이터를 바꾼 뒤 호출 - 모든 워커에서 이 네임스페이스 캐시가 무효화됨"""
+        try:
+            self.backend.bump_version(namespace)
+        except Exception as e:
+            print(f"캐시 오류: {e}")
+
+    def bind_generation(self, generation):
+        """캐시가 generation(DB 세대)의 것이 아니면 모두 비우고 그 세대로 표시 → 비웠으면 True"""
+        try:
+            return self.backend.bind_generation(generation)
+        except Exception as e:
+            print(f"캐시 오류: {e}")
+            return False
+
+
+def create_cache(path):
+    """환경 변수(CACHE_BACKEND, CACHE_PATH)에 따라 캐시 생성"""
+    backend = os.environ.get('CACHE_BACKEND', 'sqlite')
+    if backend == 'memory':
+        return SharedCache(MemoryCacheBackend())
+    return SharedCache(SQLiteCacheBackend(os.environ.get('CACHE_PATH', path)))
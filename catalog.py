@@ -0,0 +1,117 @@
+"""Project Gutenberg 오프라인 카탈로그
+
+Gutenberg 카탈로그 CSV(pg_catalog.csv, 약 7만 권)를 catalog 테이블에 불러온다.
+https://www.gutenberg.org/cache/epub/feeds/pg_catalog.csv
+
+실행:
+    python catalog.py data/pg_catalog.csv
+"""
+import csv
+import re
+import sys
+
+# 정렬/접두어 검색 시 무시하는 앞 관사 (관사만 입력한 검색어도 관사로 봄)
+LEADING_ARTICLE_RE = re.compile(r'^(?:the|a|an)(?: |$)')
+# 한 번에 저장할 행 수
+BATCH_SIZE = 5000
+
+# 어린이 책으로 볼 수 있는 주제/서가 키워드
+BEGINNER_KEYWORDS = ('juvenile', "children's", 'picture books', 'nursery rhymes', 'fairy tales', 'fables')
+# 어려운 책으로 볼 수 있는 주제/서가 키워드
+ADVANCED_KEYWORDS = ('philosophy', 'poetry', 'law', 'political science', 'theology', 'economics')
+
+
+def sort_key(text):
+    """정렬/접두어 검색용 키 (소문자, 앞 관사 제거)
+
+    검색어 "the"처럼 관사로 끝나는 경우도 제거해, 관사로 시작하는 제목을 놓치지 않음
+    """
+    text = re.sub(r'\s+', ' ', (text or '').strip().lower())
+    return LEADING_ARTICLE_RE.sub('', text, count=1)
+
+
+def prefix_range(prefix):
+    """접두어 검색을 인덱스 범위 조건으로 바꾸기 위한 (시작, 끝) 값"""
+    return prefix, prefix + '\uffff'
+
+
+def split_subjects(subjects, bookshelves=''):
+    """주제 문자열을 검색용 주제어 목록으로 분리"""
+    terms = []
+    for heading in (subjects or '').split(';') + (bookshelves or '').split(';'):
+        for part in heading.split(' -- '):
+            term = part.strip().lower()
+            if term and term not in terms:
+                terms.append(term)
+    return terms
+
+
+def guess_difficulty(subjects, locc=''):
+    """주제와 LoC 분류로 난이도 추정"""
+    text = (subjects or '').lower()
+    if (locc or '').startswith('PZ') or any(k in text for k in BEGINNER_KEYWORDS):
+        return 'beginner'
+    if any(k in text for k in ADVANCED_KEYWORDS):
+        return 'advanced'
+    return 'intermediate'
+
+
+def cover_url(gutenberg_id):
+    return f'https://www.gutenberg.org/cache/epub/{gutenberg_id}/pg{gutenberg_id}.cover.medium.jpg'
+
+
+def parse_catalog_row(row):
+    """pg_catalog.csv 한 행 → catalog 레코드 (텍스트가 아니면 None)"""
+    if row.get('Type', 'Text') != 'Text':
+        return None
+    try:
+        gutenberg_id = int(row['Text#'])
+    except (KeyError, ValueError):
+        return None
+
+    title = re.sub(r'\s+', ' ', row.get('Title') or '').strip()
+    if not title:
+        return None
+
+    subjects = row.get('Subjects') or ''
+    bookshelves = row.get('Bookshelves') or ''
+    author = (row.get('Authors') or '').split(';')[0].strip()
+    return {
+        'gutenberg_id': gutenberg_id,
+        'title': title,
+        'author': author,
+        'language': (row.get('Language') or 'en').split(';')[0].strip(),
+        'subjects': split_subjects(subjects, bookshelves),
+        'difficulty': guess_difficulty(subjects + ';' + bookshelves, row.get('LoCC')),
+        'description': subjects,
+        'cover_url': cover_url(gutenberg_id),
+    }
+
+
+def load_gutenberg_catalog(db, path):
+    """카탈로그 CSV를 BATCH_SIZE씩 나눠 저장 (저장한 책 수 반환)"""
+    total = 0
+    batch = []
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        for row in csv.DictReader(f):
+            book = parse_catalog_row(row)
+            if book is None:
+                continue
+            batch.append(book)
+            if len(batch) >= BATCH_SIZE:
+                total += db.upsert_catalog_books(batch)
+                batch = []
+    if batch:
+        total += db.upsert_catalog_books(batch)
+    return total
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 2:
+        print(__doc__)
+        sys.exit(1)
+
+    from database import Database
+
+    count = load_gutenberg_catalog(Database(), sys.argv[1])
+    print(f'카탈로그에 {count}권을 저장했습니다.')
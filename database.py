@@ -1,10 +1,350 @@
 import sqlite3
 import json
-from datetime import datetime
+import os
+import random
+import threading
+import uuid
+from datetime import datetime, date, timedelta
+
+from cache import create_cache
+from catalog import sort_key, prefix_range
+
+
+def migrate_base_schema(cursor):
+    """1: 기본 테이블 생성 및 기본 데이터 추가"""
+    # 사용자 프로필 테이블
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS user_profile (
+            id INTEGER PRIMARY KEY,
+            username TEXT NOT NULL,
+            level INTEGER DEFAULT 1,
+            experience INTEGER DEFAULT 0,
+            points INTEGER DEFAULT 0,
+            streak_days INTEGER DEFAULT 0,
+            last_activity TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
+    # 책 테이블
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS books (
+            id INTEGER PRIMARY KEY,
+            gutenberg_id INTEGER,
+            title TEXT NOT NULL,
+            author TEXT,
+            language TEXT DEFAULT 'en',
+            difficulty TEXT DEFAULT 'beginner',
+            cover_url TEXT,
+            description TEXT,
+            content TEXT,
+            total_chapters INTEGER DEFAULT 1
+        )
+    ''')
+    
+    # 읽기 진도 테이블
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS reading_progress (
+            id INTEGER PRIMARY KEY,
+            user_id INTEGER,
+            book_id INTEGER,
+            current_position INTEGER DEFAULT 0,
+            total_read INTEGER DEFAULT 0,
+            completed INTEGER DEFAULT 0,
+            last_read TEXT,
+            FOREIGN KEY (user_id) REFERENCES user_profile (id),
+            FOREIGN KEY (book_id) REFERENCES books (id)
+        )
+    ''')
+    
+    # 단어장 테이블
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS vocabulary (
+            id INTEGER PRIMARY KEY,
+            user_id INTEGER,
+            word TEXT NOT NULL,
+            translation TEXT,
+            example_sentence TEXT,
+            book_id INTEGER,
+            learned INTEGER DEFAULT 0,
+            review_count INTEGER DEFAULT 0,
+            next_review TEXT,
+            added_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES user_profile (id),
+            FOREIGN KEY (book_id) REFERENCES books (id)
+        )
+    ''')
+    
+    # 배지 테이블
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS badges (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            description TEXT,
+            icon TEXT,
+            requirement TEXT
+        )
+    ''')
+    
+    # 사용자 배지 테이블
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS user_badges (
+            id INTEGER PRIMARY KEY,
+            user_id INTEGER,
+            badge_id INTEGER,
+            earned_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES user_profile (id),
+            FOREIGN KEY (badge_id) REFERENCES badges (id)
+        )
+    ''')
+    
+    # 퀴즈 기록 테이블
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS quiz_history (
+            id INTEGER PRIMARY KEY,
+            user_id INTEGER,
+            book_id INTEGER,
+            quiz_type TEXT,
+            score INTEGER,
+            total_questions INTEGER,
+            completed_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES user_profile (id),
+            FOREIGN KEY (book_id) REFERENCES books (id)
+        )
+    ''')
+
+    # 회화 문장 테이블
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS practice_sentences (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            english TEXT NOT NULL,
+            korean TEXT NOT NULL,
+            category TEXT DEFAULT 'general',
+            difficulty INTEGER DEFAULT 1
+        )
+    ''')
+
+    # 기본 사용자 생성
+    cursor.execute('SELECT COUNT(*) as count FROM user_profile')
+    if cursor.fetchone()['count'] == 0:
+        cursor.execute('''
+            INSERT INTO user_profile (username, level, experience, points)
+            VALUES (?, ?, ?, ?)
+        ''', ('학습자', 1, 0, 0))
+
+    # 기본 배지 추가
+    cursor.execute('SELECT COUNT(*) as count FROM badges')
+    if cursor.fetchone()['count'] == 0:
+        badges = [
+            ('첫 걸음', '첫 책 읽기 시작', '🌱', 'start_first_book'),
+            ('독서왕', '첫 책 완독', '📚', 'complete_first_book'),
+            ('단어 수집가', '50개 단어 학습', '📝', 'learn_50_words'),
+            ('꾸준함의 힘', '7일 연속 학습', '🔥', '7_day_streak'),
+            ('퀴즈 마스터', '퀴즈 10회 만점', '🎯', '10_perfect_quizzes'),
+            ('초보 탈출', '레벨 5 달성', '⭐', 'reach_level_5'),
+            ('단어 마스터', '100개 단어 학습', '🏆', 'learn_100_words'),
+            ('열정적인 독서가', '30일 연속 학습', '💎', '30_day_streak'),
+        ]
+        cursor.executemany('''
+            INSERT INTO badges (name, description, icon, requirement)
+            VALUES (?, ?, ?, ?)
+        ''', badges)
+
+
+def migrate_activity_rollups(cursor):
+    """2: 일별 활동/누적 집계 테이블"""
+    # 일별 학습 활동 집계 테이블
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS daily_activity (
+            user_id INTEGER NOT NULL,
+            activity_date TEXT NOT NULL,
+            pages_read INTEGER DEFAULT 0,
+            words_added INTEGER DEFAULT 0,
+            quizzes_taken INTEGER DEFAULT 0,
+            quiz_score INTEGER DEFAULT 0,
+            experience INTEGER DEFAULT 0,
+            points INTEGER DEFAULT 0,
+            PRIMARY KEY (user_id, activity_date),
+            FOREIGN KEY (user_id) REFERENCES user_profile (id)
+        )
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_daily_activity_date
+        ON daily_activity (activity_date, user_id)
+    ''')
+
+    # 사용자별 누적 집계 테이블 (리더보드용)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS user_totals (
+            user_id INTEGER PRIMARY KEY,
+            total_points INTEGER DEFAULT 0,
+            total_experience INTEGER DEFAULT 0,
+            streak_days INTEGER DEFAULT 0,
+            best_streak INTEGER DEFAULT 0,
+            FOREIGN KEY (user_id) REFERENCES user_profile (id)
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_totals_points ON user_totals (total_points)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_totals_experience ON user_totals (total_experience)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_totals_streak ON user_totals (streak_days)')
+
+    # 누적 집계가 없는 사용자는 현재 프로필 값으로 채움
+    cursor.execute('''
+        INSERT OR IGNORE INTO user_totals (user_id, total_points, total_experience,
+                                           streak_days, best_streak)
+        SELECT id, points, (level - 1) * level * 50 + experience, streak_days, streak_days
+        FROM user_profile
+    ''')
+
+
+def migrate_hot_path_indexes(cursor):
+    """3: 자주 쓰는 조회용 인덱스"""
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_books_gutenberg_id ON books (gutenberg_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_practice_sentences_english ON practice_sentences (english)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_practice_sentences_difficulty ON practice_sentences (difficulty)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_vocabulary_user ON vocabulary (user_id, added_at)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_badges_user_badge ON user_badges (user_id, badge_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_badges_requirement ON badges (requirement)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_quiz_history_user ON quiz_history (user_id)')
+
+
+def migrate_app_meta(cursor):
+    """4: 초기 데이터 로드 상태 등을 저장하는 key-value 테이블"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS app_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        )
+    ''')
+
+
+def migrate_catalog(cursor):
+    """5: 오프라인 도서 카탈로그 (목록/필터/접두어 검색용 인덱스)"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS catalog (
+            gutenberg_id INTEGER PRIMARY KEY,
+            title TEXT NOT NULL,
+            title_sort TEXT NOT NULL,
+            author TEXT,
+            author_sort TEXT,
+            language TEXT DEFAULT 'en',
+            difficulty TEXT DEFAULT 'intermediate',
+            description TEXT,
+            cover_url TEXT,
+            featured INTEGER DEFAULT 0
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS catalog_subjects (
+            subject TEXT NOT NULL,
+            title_sort TEXT NOT NULL,
+            gutenberg_id INTEGER NOT NULL,
+            PRIMARY KEY (subject, title_sort, gutenberg_id)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_catalog_title ON catalog (title_sort, gutenberg_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_catalog_language ON catalog (language, title_sort, gutenberg_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_catalog_difficulty ON catalog (difficulty, title_sort, gutenberg_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_catalog_author ON catalog (author_sort)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_catalog_featured ON catalog (featured) WHERE featured > 0')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_catalog_subjects_book ON catalog_subjects (gutenberg_id)')
+
+
+def migrate_reading_progress_key(cursor):
+    """6: reading_progress를 (user_id, book_id)당 한 행으로 (체크포인트 upsert용)"""
+    cursor.execute('''
+        DELETE FROM reading_progress WHERE id NOT IN (
+            SELECT MAX(id) FROM reading_progress GROUP BY user_id, book_id
+        )
+    ''')
+    cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_reading_progress_user_book
+        ON reading_progress (user_id, book_id)
+    ''')
+
+
+def migrate_readability_levels(cursor):
+    """7: 문장 난이도 단계 (회화 문장 컬럼 + 책 문장 테이블)"""
+    cursor.execute('ALTER TABLE practice_sentences ADD COLUMN score REAL')
+    cursor.execute('ALTER TABLE practice_sentences ADD COLUMN level INTEGER')
+    cursor.execute('ALTER TABLE practice_sentences ADD COLUMN level_rank INTEGER')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_practice_sentences_level ON practice_sentences (level, level_rank)')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS book_sentences (
+            book_id INTEGER NOT NULL,
+            position INTEGER NOT NULL,
+            text TEXT NOT NULL,
+            word_count INTEGER NOT NULL,
+            score REAL,
+            level INTEGER,
+            level_rank INTEGER,
+            PRIMARY KEY (book_id, position),
+            FOREIGN KEY (book_id) REFERENCES books (id)
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_book_sentences_level ON book_sentences (book_id, level, level_rank)')
+
+
+def migrate_streak_dates(cursor):
+    """8: 누적 집계에 마지막 활동일 추가 (끊긴 연속 학습일을 읽을 때 0으로 보기 위함)"""
+    cursor.execute('ALTER TABLE user_totals ADD COLUMN last_activity_date TEXT')
+    cursor.execute('''
+        UPDATE user_totals SET last_activity_date = (
+            SELECT substr(last_activity, 1, 10) FROM user_profile WHERE id = user_totals.user_id
+        )
+    ''')
+    cursor.execute('DROP INDEX IF EXISTS idx_user_totals_streak')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_user_totals_streak_date
+        ON user_totals (last_activity_date, streak_days)
+    ''')
+
+
+# 만점 퀴즈로 셀 최소 문항 수
+PERFECT_QUIZ_MIN_QUESTIONS = 5
+
+
+def apply_experience(level, experience):
+    """경험치를 더한 뒤의 (레벨, 남은 경험치) - 레벨마다 level * 100 exp 필요"""
+    required_exp = level * 100
+    if experience >= required_exp:
+        return level + 1, experience - required_exp
+    return level, experience
+
+
+def current_streak(streak_days, last_activity, today=None):
+    """마지막 활동일이 어제보다 이전이면 연속 학습이 끊긴 것으로 보고 0"""
+    today = today or date.today()
+    last_date = (last_activity or '')[:10]
+    if last_date < (today - timedelta(days=1)).isoformat():
+        return 0
+    return streak_days or 0
+
+
+# 스키마 마이그레이션 목록 (버전, 함수) - 버전은 PRAGMA user_version에 기록됨
+# 새 스키마 변경은 기존 항목을 고치지 말고 다음 버전으로 추가할 것
+MIGRATIONS = [
+    (1, migrate_base_schema),
+    (2, migrate_activity_rollups),
+    (3, migrate_hot_path_indexes),
+    (4, migrate_app_meta),
+    (5, migrate_catalog),
+    (6, migrate_reading_progress_key),
+    (7, migrate_readability_levels),
+    (8, migrate_streak_dates),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
 
 class Database:
-    def __init__(self, db_name='data/books.db'):
+    # 이 프로세스에서 이미 최신 버전임을 확인한(캐시 세대도 맞춘) DB 파일
+    _migrated = set()
+    _migrate_lock = threading.Lock()
+
+    def __init__(self, db_name='data/books.db', cache=None):
         self.db_name = db_name
+        # 워커 간 공유 캐시 (기본: DB와 같은 폴더의 cache.db)
+        self.cache = cache or create_cache(os.path.join(os.path.dirname(db_name) or '.', 'cache.db'))
         self.init_db()
     
     def get_connection(self):
@@ -12,154 +352,87 @@ class Database:
         conn.row_factory = sqlite3.Row
         return conn
     
+    def get_schema_version(self, conn=None):
+        """현재 DB 스키마 버전 (PRAGMA user_version)"""
+        own_conn = conn is None
+        conn = conn or self.get_connection()
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        if own_conn:
+            conn.close()
+        return version
+    
     def init_db(self):
-        """데이터베이스 초기화"""
+        """데이터베이스 초기화 (아직 적용되지 않은 마이그레이션만 실행)"""
+        db_path = os.path.abspath(self.db_name)
+        with Database._migrate_lock:
+            if db_path in Database._migrated:
+                return
+            
+            conn = self.get_connection()
+            try:
+                if self.get_schema_version(conn) < SCHEMA_VERSION:
+                    # 여러 워커가 동시에 시작해도 한 번만 적용되도록 쓰기 잠금 후 다시 확인
+                    conn.execute('BEGIN IMMEDIATE')
+                    version = self.get_schema_version(conn)
+                    cursor = conn.cursor()
+                    for target, migrate in MIGRATIONS:
+                        if target > version:
+                            migrate(cursor)
+                            cursor.execute(f'PRAGMA user_version = {target}')
+                    conn.commit()
+            finally:
+                conn.close()
+            
+            self.sync_cache_generation()
+            Database._migrated.add(db_path)
+    
+    def get_generation(self):
+        """DB 세대 (app_meta의 id + DB 파일 번호)
+
+        cache.db는 DB 파일과 따로 있어서, DB를 이전 파일로 되돌리면(git checkout 등)
+        캐시에는 그 뒤의 데이터가 남는다. id는 처음 한 번만 만들고(동시에 만들어도
+        먼저 들어간 값 하나만 남음), 파일을 새로 받으면 파일 번호(inode)가 바뀐다.
+        """
+        conn = self.get_connection()
+        conn.execute("INSERT OR IGNORE INTO app_meta (key, value) VALUES ('cache_generation', ?)",
+                     (uuid.uuid4().hex,))
+        conn.commit()
+        generation = conn.execute("SELECT value FROM app_meta WHERE key = 'cache_generation'").fetchone()[0]
+        conn.close()
+        stat = os.stat(self.db_name)
+        return f'{generation}:{stat.st_dev}:{stat.st_ino}'
+    
+    def sync_cache_generation(self):
+        """캐시를 이 DB에 맞춤 (시작할 때 한 번) - 다른 DB의 캐시면 비움"""
+        if self.cache.bind_generation(self.get_generation()):
+            print("DB가 바뀌어 캐시를 비웠습니다.")
+    
+    def get_meta(self, key, default=None):
+        """app_meta 값 조회"""
         conn = self.get_connection()
         cursor = conn.cursor()
-        
-        # 사용자 프로필 테이블
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS user_profile (
-                id INTEGER PRIMARY KEY,
-                username TEXT NOT NULL,
-                level INTEGER DEFAULT 1,
-                experience INTEGER DEFAULT 0,
-                points INTEGER DEFAULT 0,
-                streak_days INTEGER DEFAULT 0,
-                last_activity TEXT,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # 책 테이블
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS books (
-                id INTEGER PRIMARY KEY,
-                gutenberg_id INTEGER,
-                title TEXT NOT NULL,
-                author TEXT,
-                language TEXT DEFAULT 'en',
-                difficulty TEXT DEFAULT 'beginner',
-                cover_url TEXT,
-                description TEXT,
-                content TEXT,
-                total_chapters INTEGER DEFAULT 1
-            )
-        ''')
-        
-        # 읽기 진도 테이블
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS reading_progress (
-                id INTEGER PRIMARY KEY,
-                user_id INTEGER,
-                book_id INTEGER,
-                current_position INTEGER DEFAULT 0,
-                total_read INTEGER DEFAULT 0,
-                completed INTEGER DEFAULT 0,
-                last_read TEXT,
-                FOREIGN KEY (user_id) REFERENCES user_profile (id),
-                FOREIGN KEY (book_id) REFERENCES books (id)
-            )
-        ''')
-        
-        # 단어장 테이블
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS vocabulary (
-                id INTEGER PRIMARY KEY,
-                user_id INTEGER,
-                word TEXT NOT NULL,
-                translation TEXT,
-                example_sentence TEXT,
-                book_id INTEGER,
-                learned INTEGER DEFAULT 0,
-                review_count INTEGER DEFAULT 0,
-                next_review TEXT,
-                added_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES user_profile (id),
-                FOREIGN KEY (book_id) REFERENCES books (id)
-            )
-        ''')
-        
-        # 배지 테이블
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS badges (
-                id INTEGER PRIMARY KEY,
-                name TEXT NOT NULL,
-                description TEXT,
-                icon TEXT,
-                requirement TEXT
-            )
-        ''')
-        
-        # 사용자 배지 테이블
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS user_badges (
-                id INTEGER PRIMARY KEY,
-                user_id INTEGER,
-                badge_id INTEGER,
-                earned_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES user_profile (id),
-                FOREIGN KEY (badge_id) REFERENCES badges (id)
-            )
-        ''')
-        
-        # 퀴즈 기록 테이블
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS quiz_history (
-                id INTEGER PRIMARY KEY,
-                user_id INTEGER,
-                book_id INTEGER,
-                quiz_type TEXT,
-                score INTEGER,
-                total_questions INTEGER,
-                completed_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES user_profile (id),
-                FOREIGN KEY (book_id) REFERENCES books (id)
-            )
-        ''')
-
-        # 회화 문장 테이블
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS practice_sentences (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                english TEXT NOT NULL,
-                korean TEXT NOT NULL,
-                category TEXT DEFAULT 'general',
-                difficulty INTEGER DEFAULT 1
-            )
-        ''')
-        
-        # 기본 사용자 생성
-        cursor.execute('SELECT COUNT(*) as count FROM user_profile')
-        if cursor.fetchone()['count'] == 0:
-            cursor.execute('''
-                INSERT INTO user_profile (username, level, experience, points)
-                VALUES (?, ?, ?, ?)
-            ''', ('학습자', 1, 0, 0))
-        
-        # 기본 배지 추가
-        cursor.execute('SELECT COUNT(*) as count FROM badges')
-        if cursor.fetchone()['count'] == 0:
-            badges = [
-                ('첫 걸음', '첫 책 읽기 시작', '🌱', 'start_first_book'),
-                ('독서왕', '첫 책 완독', '📚', 'complete_first_book'),
-                ('단어 수집가', '50개 단어 학습', '📝', 'learn_50_words'),
-                ('꾸준함의 힘', '7일 연속 학습', '🔥', '7_day_streak'),
-                ('퀴즈 마스터', '퀴즈 10회 만점', '🎯', '10_perfect_quizzes'),
-                ('초보 탈출', '레벨 5 달성', '⭐', 'reach_level_5'),
-                ('단어 마스터', '100개 단어 학습', '🏆', 'learn_100_words'),
-                ('열정적인 독서가', '30일 연속 학습', '💎', '30_day_streak'),
-            ]
-            cursor.executemany('''
-                INSERT INTO badges (name, description, icon, requirement)
-                VALUES (?, ?, ?, ?)
-            ''', badges)
-        
+        cursor.execute('SELECT value FROM app_meta WHERE key = ?', (key,))
+        row = cursor.fetchone()
+        conn.close()
+        return row['value'] if row else default
+    
+    def set_meta(self, key, value):
+        """app_meta 값 저장"""
+        conn = self.get_connection()
+        conn.execute('''
+            INSERT INTO app_meta (key, value) VALUES (?, ?)
+            ON CONFLICT (key) DO UPDATE SET value = excluded.value
+        ''', (key, value))
         conn.commit()
         conn.close()
     
-    def get_user_profile(self, user_id=1):
-        """사용자 프로필 조회"""
+    def get_user_profile(self, user_id=1, today=None):
+        """사용자 프로필 조회 (공유 캐시, 연속 학습일은 조회 시점 기준)"""
+        profile = self.cache.get_or_set('profile', user_id, lambda: self._load_user_profile(user_id))
+        profile['streak_days'] = current_streak(profile['streak_days'], profile['last_activity'], today)
+        return profile
+    
+    def _load_user_profile(self, user_id):
         conn = self.get_connection()
         cursor = conn.cursor()
         cursor.execute('SELECT * FROM user_profile WHERE id = ?', (user_id,))
@@ -181,18 +454,12 @@ class Database:
         
         conn.commit()
         conn.close()
+        self.cache.invalidate('profile')
     
     def add_experience(self, user_id, exp):
         """경험치 추가 및 레벨업 체크"""
         profile = self.get_user_profile(user_id)
-        new_exp = profile['experience'] + exp
-        new_level = profile['level']
-        
-        # 레벨업 계산 (100 exp per level)
-        required_exp = new_level * 100
-        if new_exp >= required_exp:
-            new_level += 1
-            new_exp = new_exp - required_exp
+        new_level, new_exp = apply_experience(profile['level'], profile['experience'] + exp)
         
         self.update_user_profile(user_id, experience=new_exp, level=new_level)
         return new_level > profile['level']  # 레벨업 여부 반환
@@ -221,6 +488,7 @@ class Database:
         book_id = cursor.lastrowid
         conn.commit()
         conn.close()
+        self.cache.invalidate('books')
         return book_id
     
     def get_all_books(self):
@@ -259,9 +527,27 @@ class Database:
         
         conn.commit()
         conn.close()
+        self.cache.invalidate('vocabulary')
+    
+    def set_vocabulary_learned(self, user_id, vocab_id, learned):
+        """단어의 학습 완료 여부 변경 → 단어가 있으면 True"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            UPDATE vocabulary SET learned = ? WHERE id = ? AND user_id = ?
+        ''', (1 if learned else 0, vocab_id, user_id))
+        found = cursor.rowcount > 0
+        conn.commit()
+        conn.close()
+        if found:
+            self.cache.invalidate('vocabulary')
+        return found
     
     def get_vocabulary(self, user_id):
-        """사용자 단어장 조회"""
+        """사용자 단어장 조회 (공유 캐시)"""
+        return self.cache.get_or_set('vocabulary', user_id, lambda: self._load_vocabulary(user_id))
+    
+    def _load_vocabulary(self, user_id):
         conn = self.get_connection()
         cursor = conn.cursor()
         cursor.execute('''
@@ -337,6 +623,26 @@ class Database:
         conn.close()
         return True
 
+    def replace_practice_sentences(self, sentences):
+        """회화 연습 문장 전체 교체 (한 트랜잭션, 영어 문장 중복 제외)
+
+        sentences: [(english, korean, category, difficulty), ...]
+        """
+        unique = {}
+        for row in sentences:
+            unique.setdefault(row[0], row)
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('DELETE FROM practice_sentences')
+        cursor.executemany('''
+            INSERT INTO practice_sentences (english, korean, category, difficulty)
+            VALUES (?, ?, ?, ?)
+        ''', list(unique.values()))
+        conn.commit()
+        conn.close()
+        return len(unique)
+
     def get_random_practice_sentences(self, limit=10, difficulty=None):
         """회화 연습 문장 랜덤 추출"""
         conn = self.get_connection()
@@ -358,6 +664,108 @@ class Database:
         conn.close()
         return sentences
 
+    def get_practice_sentences_for_scoring(self):
+        """채점할 회화 문장 목록 [(id, english), ...]"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('SELECT id, english FROM practice_sentences ORDER BY id')
+        rows = [(row['id'], row['english']) for row in cursor.fetchall()]
+        conn.close()
+        return rows
+
+    def save_practice_sentence_levels(self, rows):
+        """회화 문장 채점 결과 저장 (한 트랜잭션)
+
+        rows: [(score, level, level_rank, id), ...]
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.executemany('''
+            UPDATE practice_sentences SET score = ?, level = ?, level_rank = ? WHERE id = ?
+        ''', rows)
+        conn.commit()
+        conn.close()
+
+    def count_unscored_practice_sentences(self):
+        """아직 채점 안 된 회화 문장 수"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('SELECT COUNT(*) as count FROM practice_sentences WHERE level IS NULL')
+        count = cursor.fetchone()['count']
+        conn.close()
+        return count
+
+    def _sample_by_level(self, cursor, table, where, params, limit, extra_where='', extra_params=()):
+        """(level, level_rank) 인덱스로 단계 안에서 임의 문장 limit개 추출
+
+        level_rank는 섞어서 매겨져 있으므로 임의 순번부터 이어서 읽으면 무작위 표본이 된다.
+        where는 인덱스 앞부분 조건, extra_where는 읽으면서 거르는 추가 조건.
+        """
+        cursor.execute(f'SELECT MAX(level_rank) as max_rank FROM {table} WHERE {where}', params)
+        max_rank = cursor.fetchone()['max_rank']
+        if max_rank is None:
+            return []
+        start = random.randint(0, max_rank)
+        cursor.execute(f'''
+            SELECT * FROM {table} WHERE {where} {extra_where} AND level_rank >= ?
+            ORDER BY level_rank LIMIT ?
+        ''', (*params, *extra_params, start, limit))
+        rows = [dict(row) for row in cursor.fetchall()]
+        if len(rows) < limit:
+            # 끝까지 읽었으면 처음부터 이어서
+            cursor.execute(f'''
+                SELECT * FROM {table} WHERE {where} {extra_where} AND level_rank < ?
+                ORDER BY level_rank LIMIT ?
+            ''', (*params, *extra_params, start, limit - len(rows)))
+            rows += [dict(row) for row in cursor.fetchall()]
+        return rows
+
+    def get_practice_sentences_by_level(self, level, limit=10):
+        """난이도 단계의 회화 문장 임의 추출"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        rows = self._sample_by_level(cursor, 'practice_sentences', 'level = ?', (level,), limit)
+        conn.close()
+        return [{'english': row['english'], 'korean': row['korean'], 'level': row['level']} for row in rows]
+
+    def replace_book_sentences(self, book_id, sentences):
+        """책 문장 채점 결과 전체 교체 (한 트랜잭션)
+
+        sentences: [(position, text, word_count, score, level, level_rank), ...]
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('DELETE FROM book_sentences WHERE book_id = ?', (book_id,))
+        cursor.executemany('''
+            INSERT INTO book_sentences (book_id, position, text, word_count, score, level, level_rank)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', [(book_id, *row) for row in sentences])
+        conn.commit()
+        conn.close()
+        self.cache.invalidate('sentences')
+
+    def get_book_level_counts(self, book_id):
+        """책의 난이도 단계별 문장 수 {level: count} (채점 전이면 빈 dict)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT level, COUNT(*) as count FROM book_sentences
+            WHERE book_id = ? GROUP BY level
+        ''', (book_id,))
+        counts = {row['level']: row['count'] for row in cursor.fetchall()}
+        conn.close()
+        return counts
+
+    def get_book_sentences_by_level(self, book_id, level, limit=10, max_words=None):
+        """책에서 난이도 단계의 문장 임의 추출 (max_words: 최대 단어 수)"""
+        extra_where, extra_params = ('AND word_count <= ?', (max_words,)) if max_words else ('', ())
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        rows = self._sample_by_level(cursor, 'book_sentences', 'book_id = ? AND level = ?', (book_id, level),
+                                     limit, extra_where, extra_params)
+        conn.close()
+        return [{'position': row['position'], 'text': row['text'], 'level': row['level']} for row in rows]
+
     def get_practice_sentences_count(self):
         """전체 회화 문장 수 조회"""
         conn = self.get_connection()
@@ -367,3 +775,461 @@ class Database:
         conn.close()
         return count
 
+
+    def save_quiz_result(self, user_id, answers, quiz_type='vocabulary', book_id=None):
+        """퀴즈 결과 기록 (quiz_history + 단어별 복습 횟수를 한 트랜잭션으로 저장)
+
+        answers: 서버에서 채점한 결과 [{'vocabulary_id': int, 'correct': bool}, ...]
+        perfect_count는 PERFECT_QUIZ_MIN_QUESTIONS문항 이상을 모두 맞힌 퀴즈 수
+        """
+        score = sum(1 for a in answers if a.get('correct'))
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            INSERT INTO quiz_history (user_id, book_id, quiz_type, score, total_questions)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (user_id, book_id, quiz_type, score, len(answers)))
+
+        cursor.executemany('''
+            UPDATE vocabulary
+            SET review_count = review_count + 1
+            WHERE id = ? AND user_id = ?
+        ''', [(a.get('vocabulary_id'), user_id) for a in answers])
+
+        cursor.execute('''
+            SELECT COUNT(*) as count FROM quiz_history
+            WHERE user_id = ? AND total_questions >= ? AND score = total_questions
+        ''', (user_id, PERFECT_QUIZ_MIN_QUESTIONS))
+        perfect_count = cursor.fetchone()['count']
+
+        conn.commit()
+        conn.close()
+        self.cache.invalidate('vocabulary')
+        return {'score': score, 'total': len(answers), 'perfect_count': perfect_count}
+
+    def record_activity(self, user_id, pages_read=0, words_added=0, quizzes_taken=0,
+                        quiz_score=0, experience=0, points=0, today=None):
+        """학습 활동을 일별 집계에 반영하고 연속 학습일 갱신
+
+        마지막 활동일만 보고 연속 학습일을 계산하므로 이벤트당 O(1)
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        streak = self._record_activity(cursor, user_id, pages_read, words_added, quizzes_taken,
+                                       quiz_score, experience, points, today)
+        conn.commit()
+        conn.close()
+        self.cache.invalidate('profile')
+        return streak
+
+    def award_activity(self, user_id, pages_read=0, words_added=0, quizzes_taken=0,
+                       quiz_score=0, experience=0, points=0, today=None):
+        """경험치/포인트 지급과 활동 기록을 한 트랜잭션으로 → (레벨업 여부, 연속 학습일)
+
+        중간에 실패하면 아무것도 반영되지 않으므로 그대로 다시 시도해도 두 번 지급되지 않는다.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute('SELECT level, experience FROM user_profile WHERE id = ?', (user_id,))
+            row = cursor.fetchone()
+            new_level, new_exp = apply_experience(row['level'], row['experience'] + experience)
+            cursor.execute('''
+                UPDATE user_profile SET level = ?, experience = ?, points = points + ? WHERE id = ?
+            ''', (new_level, new_exp, points, user_id))
+            streak = self._record_activity(cursor, user_id, pages_read, words_added, quizzes_taken,
+                                           quiz_score, experience, points, today)
+            conn.commit()
+        finally:
+            conn.close()
+        self.cache.invalidate('profile')
+        return new_level > row['level'], streak
+
+    def _record_activity(self, cursor, user_id, pages_read, words_added, quizzes_taken,
+                         quiz_score, experience, points, today):
+        """일별 집계/연속 학습일/누적 집계 갱신 (커밋은 호출한 쪽에서) → 연속 학습일"""
+        today = today or date.today()
+        today_str = today.isoformat()
+
+        cursor.execute('''
+            INSERT INTO daily_activity (user_id, activity_date, pages_read, words_added,
+                                        quizzes_taken, quiz_score, experience, points)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (user_id, activity_date) DO UPDATE SET
+                pages_read = pages_read + excluded.pages_read,
+                words_added = words_added + excluded.words_added,
+                quizzes_taken = quizzes_taken + excluded.quizzes_taken,
+                quiz_score = quiz_score + excluded.quiz_score,
+                experience = experience + excluded.experience,
+                points = points + excluded.points
+        ''', (user_id, today_str, pages_read, words_added, quizzes_taken, quiz_score, experience, points))
+
+        # 연속 학습일 계산
+        cursor.execute('SELECT streak_days, last_activity FROM user_profile WHERE id = ?', (user_id,))
+        row = cursor.fetchone()
+        streak = row['streak_days'] or 0
+        last_date = (row['last_activity'] or '')[:10]
+
+        if last_date == today_str:
+            streak = max(streak, 1)
+        elif last_date == (today - timedelta(days=1)).isoformat():
+            streak += 1
+        else:
+            streak = 1
+
+        cursor.execute('''
+            UPDATE user_profile SET streak_days = ?, last_activity = ? WHERE id = ?
+        ''', (streak, today_str, user_id))
+
+        cursor.execute('''
+            INSERT INTO user_totals (user_id, total_points, total_experience, streak_days, best_streak,
+                                     last_activity_date)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (user_id) DO UPDATE SET
+                total_points = total_points + excluded.total_points,
+                total_experience = total_experience + excluded.total_experience,
+                streak_days = excluded.streak_days,
+                best_streak = MAX(best_streak, excluded.streak_days),
+                last_activity_date = excluded.last_activity_date
+        ''', (user_id, points, experience, streak, streak, today_str))
+        return streak
+
+    def get_daily_activity(self, user_id, days=30):
+        """최근 N일 학습 활동 조회"""
+        since = (date.today() - timedelta(days=days - 1)).isoformat()
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT * FROM daily_activity
+            WHERE user_id = ? AND activity_date >= ?
+            ORDER BY activity_date
+        ''', (user_id, since))
+        activity = [dict(row) for row in cursor.fetchall()]
+        conn.close()
+        return activity
+
+    def get_leaderboard(self, order_by='points', period='all', limit=10, today=None):
+        """리더보드 조회 (누적 집계 또는 최근 7일 집계 기준)
+
+        연속 학습일은 마지막 활동일이 어제 이전이면 0으로 본다.
+        지원하지 않는 기준/기간이면 ValueError.
+        """
+        today = today or date.today()
+        yesterday = (today - timedelta(days=1)).isoformat()
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        if period == 'week':
+            column = {'points': 'points', 'experience': 'experience'}.get(order_by)
+            if column is None:
+                conn.close()
+                raise ValueError(f'주간 리더보드는 {order_by} 기준을 지원하지 않습니다')
+            since = (today - timedelta(days=6)).isoformat()
+            cursor.execute(f'''
+                SELECT da.user_id, up.username, SUM(da.{column}) as score
+                FROM daily_activity da
+                JOIN user_profile up ON up.id = da.user_id
+                WHERE da.activity_date >= ?
+                GROUP BY da.user_id
+                ORDER BY score DESC
+                LIMIT ?
+            ''', (since, limit))
+            leaderboard = [dict(row) for row in cursor.fetchall()]
+        elif period != 'all':
+            conn.close()
+            raise ValueError(f'지원하지 않는 기간입니다: {period}')
+        elif order_by == 'streak':
+            # 연속 학습 중인 사용자는 마지막 활동일이 어제 또는 오늘인 사용자뿐이므로
+            # (last_activity_date, streak_days) 인덱스에서 두 날짜 구간만 읽음
+            columns = '''ut.user_id, up.username, ut.total_points, ut.total_experience,
+                         ut.best_streak, ut.last_activity_date'''
+            cursor.execute(f'''
+                SELECT * FROM (
+                    SELECT {columns}, ut.streak_days FROM user_totals ut
+                    JOIN user_profile up ON up.id = ut.user_id
+                    WHERE ut.last_activity_date = ? ORDER BY ut.streak_days DESC LIMIT ?
+                )
+                UNION ALL
+                SELECT * FROM (
+                    SELECT {columns}, ut.streak_days FROM user_totals ut
+                    JOIN user_profile up ON up.id = ut.user_id
+                    WHERE ut.last_activity_date = ? ORDER BY ut.streak_days DESC LIMIT ?
+                )
+                ORDER BY streak_days DESC
+                LIMIT ?
+            ''', (today.isoformat(), limit, yesterday, limit, limit))
+            leaderboard = [dict(row) for row in cursor.fetchall()]
+
+            # 부족하면 연속 학습이 끊긴 사용자(0일)로 채움
+            if len(leaderboard) < limit:
+                cursor.execute(f'''
+                    SELECT {columns}, 0 as streak_days FROM user_totals ut
+                    JOIN user_profile up ON up.id = ut.user_id
+                    WHERE ut.last_activity_date IS NULL OR ut.last_activity_date < ?
+                    LIMIT ?
+                ''', (yesterday, limit - len(leaderboard)))
+                leaderboard += [dict(row) for row in cursor.fetchall()]
+            for entry in leaderboard:
+                entry['score'] = entry['streak_days']
+        else:
+            column = {'points': 'total_points', 'experience': 'total_experience'}.get(order_by)
+            if column is None:
+                conn.close()
+                raise ValueError(f'지원하지 않는 기준입니다: {order_by}')
+            cursor.execute(f'''
+                SELECT ut.user_id, up.username, ut.{column} as score,
+                       ut.total_points, ut.total_experience, ut.best_streak, ut.last_activity_date,
+                       CASE WHEN ut.last_activity_date >= ? THEN ut.streak_days ELSE 0 END as streak_days
+                FROM user_totals ut
+                JOIN user_profile up ON up.id = ut.user_id
+                ORDER BY ut.{column} DESC
+                LIMIT ?
+            ''', (yesterday, limit))
+            leaderboard = [dict(row) for row in cursor.fetchall()]
+
+        conn.close()
+        return leaderboard
+
+    def upsert_catalog_books(self, books):
+        """카탈로그에 책 추가/갱신 (한 트랜잭션, 추천 도서 정보는 덮어쓰지 않음)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.executemany('''
+            INSERT INTO catalog (gutenberg_id, title, title_sort, author, author_sort,
+                                 language, difficulty, description, cover_url)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (gutenberg_id) DO UPDATE SET
+                title = excluded.title,
+                title_sort = excluded.title_sort,
+                author = excluded.author,
+                author_sort = excluded.author_sort,
+                language = excluded.language,
+                difficulty = excluded.difficulty,
+                description = excluded.description,
+                cover_url = excluded.cover_url
+            WHERE catalog.featured = 0
+        ''', [(
+            book['gutenberg_id'],
+            book['title'],
+            sort_key(book['title']),
+            book.get('author'),
+            sort_key(book.get('author')),
+            book.get('language', 'en'),
+            book.get('difficulty', 'intermediate'),
+            book.get('description'),
+            book.get('cover_url'),
+        ) for book in books])
+
+        cursor.executemany('DELETE FROM catalog_subjects WHERE gutenberg_id = ?',
+                           [(book['gutenberg_id'],) for book in books])
+        cursor.executemany('''
+            INSERT OR IGNORE INTO catalog_subjects (subject, title_sort, gutenberg_id)
+            SELECT ?, title_sort, gutenberg_id FROM catalog WHERE gutenberg_id = ?
+        ''', [(subject, book['gutenberg_id']) for book in books for subject in book.get('subjects', [])])
+
+        conn.commit()
+        conn.close()
+        self.cache.invalidate('books')
+        return len(books)
+
+    def set_featured_books(self, books):
+        """추천 도서(도서관 첫 화면) 목록 저장 - 순서대로 featured 1, 2, 3..."""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('UPDATE catalog SET featured = 0 WHERE featured > 0')
+        cursor.executemany('''
+            INSERT INTO catalog (gutenberg_id, title, title_sort, author, author_sort,
+                                 language, difficulty, description, cover_url, featured)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (gutenberg_id) DO UPDATE SET
+                title = excluded.title,
+                title_sort = excluded.title_sort,
+                author = excluded.author,
+                author_sort = excluded.author_sort,
+                difficulty = excluded.difficulty,
+                description = excluded.description,
+                cover_url = excluded.cover_url,
+                featured = excluded.featured
+        ''', [(
+            book['gutenberg_id'],
+            book['title'],
+            sort_key(book['title']),
+            book.get('author'),
+            sort_key(book.get('author')),
+            book.get('language', 'en'),
+            book.get('difficulty', 'beginner'),
+            book.get('description'),
+            book.get('cover_url'),
+            rank,
+        ) for rank, book in enumerate(books, start=1)])
+        conn.commit()
+        conn.close()
+        self.cache.invalidate('books')
+
+    def get_featured_books(self):
+        """추천 도서 + 검색해서 내려받은 책 목록 (다운로드 여부 포함, 공유 캐시)"""
+        return self.cache.get_or_set('books', 'featured', self._load_featured_books)
+
+    def _load_featured_books(self):
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT c.gutenberg_id, c.title, c.author, c.language, c.difficulty,
+                   c.description, c.cover_url,
+                   (SELECT MAX(b.id) FROM books b WHERE b.gutenberg_id = c.gutenberg_id) as id
+            FROM catalog c
+            WHERE c.featured > 0
+            ORDER BY c.featured
+        ''')
+        books = [dict(row) for row in cursor.fetchall()]
+
+        # 추천 도서가 아닌 내려받은 책 (같은 책은 마지막으로 받은 것만, 최근 순)
+        cursor.execute('''
+            SELECT b.gutenberg_id, b.title, b.author, b.language, b.difficulty,
+                   b.description, b.cover_url, b.id
+            FROM books b
+            WHERE NOT EXISTS (SELECT 1 FROM books newer
+                              WHERE newer.gutenberg_id = b.gutenberg_id AND newer.id > b.id)
+              AND NOT EXISTS (SELECT 1 FROM catalog c
+                              WHERE c.gutenberg_id = b.gutenberg_id AND c.featured > 0)
+            ORDER BY b.id DESC
+        ''')
+        books += [dict(row) for row in cursor.fetchall()]
+        conn.close()
+        for book in books:
+            book['is_downloaded'] = book['id'] is not None
+        return books
+
+    def get_catalog_book(self, gutenberg_id):
+        """카탈로그에서 책 정보 조회"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT gutenberg_id, title, author, language, difficulty, description, cover_url
+            FROM catalog WHERE gutenberg_id = ?
+        ''', (gutenberg_id,))
+        row = cursor.fetchone()
+        conn.close()
+        return dict(row) if row else None
+
+    def browse_catalog(self, author=None, language=None, subject=None, difficulty=None,
+                       title_prefix=None, after=None, limit=20):
+        """카탈로그 목록 (제목순, after=마지막으로 받은 gutenberg_id 다음부터)
+
+        OFFSET 대신 (title_sort, gutenberg_id) 기준으로 이어서 조회하므로
+        몇 번째 페이지든, 카탈로그 크기와 관계없이 인덱스 범위만 읽음
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        # 주제 필터는 catalog_subjects 인덱스를 기준으로 정렬/페이지 처리
+        base = 's' if subject else 'c'
+        if subject:
+            sql = '''
+                SELECT c.*, (SELECT MAX(b.id) FROM books b WHERE b.gutenberg_id = c.gutenberg_id) as id
+                FROM catalog_subjects s
+                JOIN catalog c ON c.gutenberg_id = s.gutenberg_id
+                WHERE s.subject = ?
+            '''
+            params = [subject.strip().lower()]
+        else:
+            sql = '''
+                SELECT c.*, (SELECT MAX(b.id) FROM books b WHERE b.gutenberg_id = c.gutenberg_id) as id
+                FROM catalog c WHERE 1 = 1
+            '''
+            params = []
+
+        if language:
+            sql += ' AND c.language = ?'
+            params.append(language)
+        if difficulty:
+            sql += ' AND c.difficulty = ?'
+            params.append(difficulty)
+        if author:
+            start, end = prefix_range(sort_key(author))
+            sql += ' AND c.author_sort >= ? AND c.author_sort < ?'
+            params += [start, end]
+        if title_prefix:
+            start, end = prefix_range(sort_key(title_prefix))
+            sql += f' AND {base}.title_sort >= ? AND {base}.title_sort < ?'
+            params += [start, end]
+        if after is not None:
+            cursor.execute('SELECT title_sort FROM catalog WHERE gutenberg_id = ?', (after,))
+            row = cursor.fetchone()
+            if row:
+                sql += f' AND ({base}.title_sort, {base}.gutenberg_id) > (?, ?)'
+                params += [row['title_sort'], after]
+
+        sql += f' ORDER BY {base}.title_sort, {base}.gutenberg_id LIMIT ?'
+        params.append(limit + 1)
+
+        cursor.execute(sql, params)
+        rows = [dict(row) for row in cursor.fetchall()]
+        conn.close()
+
+        has_more = len(rows) > limit
+        books = rows[:limit]
+        for book in books:
+            book.pop('title_sort', None)
+            book.pop('author_sort', None)
+            book.pop('featured', None)
+            book['is_downloaded'] = book['id'] is not None
+        return {
+            'books': books,
+            'next_after': books[-1]['gutenberg_id'] if has_more else None,
+        }
+
+    def save_reading_progress(self, checkpoints):
+        """읽기 체크포인트 여러 개를 한 트랜잭션으로 저장
+
+        checkpoints: [{'user_id', 'book_id', 'current_position', 'total_read', 'completed', 'last_read'}, ...]
+        다른 워커가 더 최근 위치를 먼저 저장했으면 현재 위치는 덮어쓰지 않는다.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.executemany('''
+            INSERT INTO reading_progress (user_id, book_id, current_position, total_read, completed, last_read)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (user_id, book_id) DO UPDATE SET
+                current_position = CASE WHEN excluded.last_read >= IFNULL(last_read, '')
+                                        THEN excluded.current_position ELSE current_position END,
+                total_read = MAX(total_read, excluded.total_read),
+                completed = MAX(completed, excluded.completed),
+                last_read = MAX(IFNULL(last_read, ''), excluded.last_read)
+        ''', [(
+            c['user_id'], c['book_id'], c['current_position'], c['total_read'],
+            1 if c.get('completed') else 0, c['last_read']
+        ) for c in checkpoints])
+        conn.commit()
+        conn.close()
+
+    def get_reading_progress(self, user_id, book_id):
+        """책 읽기 체크포인트 조회 (없으면 None)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT user_id, book_id, current_position, total_read, completed, last_read
+            FROM reading_progress WHERE user_id = ? AND book_id = ?
+        ''', (user_id, book_id))
+        row = cursor.fetchone()
+        conn.close()
+        if not row:
+            return None
+        progress = dict(row)
+        progress['completed'] = bool(progress['completed'])
+        return progress
+
+    def get_book_text_range(self, book_id, start, length):
+        """책 본문 일부 조회 → {'title', 'text', 'total_length'} 또는 None"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT title, substr(content, ?, ?) as text, length(content) as total_length
+            FROM books WHERE id = ?
+        ''', (start + 1, length, book_id))
+        row = cursor.fetchone()
+        conn.close()
+        if not row:
+            return None
+        return {'title': row['title'], 'text': row['text'] or '', 'total_length': row['total_length'] or 0}
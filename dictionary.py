@@ -0,0 +1,153 @@
+"""오프라인 영한 사전
+
+단어 하나를 번역할 때 외부 번역 API 대신 로컬 단어 목록을 먼저 찾는다.
+사전 파일은 한 줄에 `영어단어<TAB>한국어뜻` 형식 (UTF-8, '#'으로 시작하면 주석).
+
+표제어는 정렬된 리스트에, 뜻은 하나의 문자열 + 오프셋 배열에 담아
+단어 수가 많아도 메모리를 적게 쓰고, bisect로 정확/접두어 검색을 한다.
+"""
+import os
+import re
+from array import array
+from bisect import bisect_left
+
+# 불규칙 변화형 → 원형
+IRREGULAR_FORMS = {
+    'am': 'be', 'is': 'be', 'are': 'be', 'was': 'be', 'were': 'be', 'been': 'be', 'being': 'be',
+    'has': 'have', 'had': 'have', 'does': 'do', 'did': 'do', 'done': 'do',
+    'went': 'go', 'gone': 'go', 'saw': 'see', 'seen': 'see', 'came': 'come',
+    'took': 'take', 'taken': 'take', 'made': 'make', 'said': 'say', 'got': 'get', 'gotten': 'get',
+    'knew': 'know', 'known': 'know', 'thought': 'think', 'told': 'tell', 'found': 'find',
+    'gave': 'give', 'given': 'give', 'felt': 'feel', 'left': 'leave', 'began': 'begin', 'begun': 'begin',
+    'ran': 'run', 'wrote': 'write', 'written': 'write', 'spoke': 'speak', 'spoken': 'speak',
+    'ate': 'eat', 'eaten': 'eat', 'brought': 'bring', 'bought': 'buy', 'caught': 'catch',
+    'taught': 'teach', 'heard': 'hear', 'held': 'hold', 'kept': 'keep', 'slept': 'sleep',
+    'stood': 'stand', 'sat': 'sit', 'met': 'meet', 'lost': 'lose', 'fell': 'fall', 'fallen': 'fall',
+    'children': 'child', 'men': 'man', 'women': 'woman', 'feet': 'foot', 'teeth': 'tooth',
+    'mice': 'mouse', 'geese': 'goose', 'people': 'person',
+    'better': 'good', 'best': 'good', 'worse': 'bad', 'worst': 'bad',
+}
+
+# (접미사, 바꿀 문자열) - 위에서부터 차례로 시도
+SUFFIX_RULES = [
+    ('ies', 'y'), ('ves', 'f'), ('ves', 'fe'), ('sses', 'ss'), ('xes', 'x'), ('ches', 'ch'),
+    ('shes', 'sh'), ('oes', 'o'), ('s', ''),
+    ('ied', 'y'), ('ed', ''), ('ed', 'e'),
+    ('ying', 'ie'), ('ing', ''), ('ing', 'e'),
+    ('ier', 'y'), ('iest', 'y'), ('er', ''), ('est', ''), ('er', 'e'), ('est', 'e'),
+    ('ily', 'y'), ('ly', ''),
+]
+
+WORD_RE = re.compile(r"[a-z]+(?:[-'][a-z]+)*")
+
+
+def normalize_word(word):
+    """소문자로 바꾸고 앞뒤 문장부호와 소유격 's 제거"""
+    match = WORD_RE.search((word or '').lower().replace('’', "'"))
+    if not match:
+        return ''
+    word = match.group(0)
+    if word.endswith("'s"):
+        word = word[:-2]
+    return word
+
+
+def lemma_candidates(word):
+    """찾아볼 표제어 후보 (원래 형태 → 불규칙형 → 접미사 규칙 순)"""
+    word = normalize_word(word)
+    if not word:
+        return []
+
+    candidates = [word]
+    if word in IRREGULAR_FORMS:
+        candidates.append(IRREGULAR_FORMS[word])
+
+    for suffix, replacement in SUFFIX_RULES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 2:
+            stem = word[:-len(suffix)]
+            candidates.append(stem + replacement)
+            # running → run, stopped → stop (자음 중복)
+            if replacement == '' and len(stem) >= 3 and stem[-1] == stem[-2] and stem[-1] not in 'aeiouls':
+                candidates.append(stem[:-1])
+
+    seen = set()
+    return [c for c in candidates if not (c in seen or seen.add(c))]
+
+
+class Dictionary:
+    """정렬된 표제어 배열 기반 영한 사전"""
+
+    def __init__(self, entries=()):
+        merged = {}
+        for word, meaning in entries:
+            word = re.sub(r'\s+', ' ', (word or '').strip().lower())
+            meaning = (meaning or '').strip()
+            if not word or not meaning:
+                continue
+            if word in merged:
+                if meaning not in merged[word].split(', '):
+                    merged[word] += ', ' + meaning
+            else:
+                merged[word] = meaning
+
+        self.words = sorted(merged)
+        self.offsets = array('I', [0])
+        parts = []
+        for word in self.words:
+            parts.append(merged[word])
+            self.offsets.append(self.offsets[-1] + len(merged[word]))
+        self.meanings = ''.join(parts)
+
+    @classmethod
+    def load(cls, path):
+        """사전 파일 로드 (파일이 없으면 빈 사전)"""
+        if not path or not os.path.exists(path):
+            return cls()
+
+        def read_entries():
+            with open(path, 'r', encoding='utf-8-sig') as f:
+                for line in f:
+                    if not line.strip() or line.startswith('#'):
+                        continue
+                    word, _, meaning = line.rstrip('\n').partition('\t')
+                    yield word, meaning
+
+        return cls(read_entries())
+
+    def __len__(self):
+        return len(self.words)
+
+    def _meaning_at(self, idx):
+        return self.meanings[self.offsets[idx]:self.offsets[idx + 1]]
+
+    def _find(self, word):
+        idx = bisect_left(self.words, word)
+        if idx < len(self.words) and self.words[idx] == word:
+            return idx
+        return -1
+
+    def lookup(self, word):
+        """단어 뜻 찾기 → {'word', 'lemma', 'translation'} 또는 None"""
+        # 원래 형태가 있으면 후보 목록을 만들지 않고 바로 반환
+        normalized = normalize_word(word)
+        idx = self._find(normalized)
+        if idx >= 0:
+            return {'word': word, 'lemma': normalized, 'translation': self._meaning_at(idx)}
+
+        for candidate in lemma_candidates(normalized)[1:]:
+            idx = self._find(candidate)
+            if idx >= 0:
+                return {'word': word, 'lemma': candidate, 'translation': self._meaning_at(idx)}
+        return None
+
+    def prefix(self, prefix, limit=10):
+        """접두어로 시작하는 표제어 목록 (자동완성용)"""
+        prefix = normalize_word(prefix)
+        if not prefix:
+            return []
+        results = []
+        idx = bisect_left(self.words, prefix)
+        while idx < len(self.words) and len(results) < limit and self.words[idx].startswith(prefix):
+            results.append({'word': self.words[idx], 'translation': self._meaning_at(idx)})
+            idx += 1
+        return results
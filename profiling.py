@@ -0,0 +1,271 @@
+"""요청 단위 프로파일링
+
+운영 중 느린 요청의 원인을 재배포 없이 보기 위한 선택 기능. 켜진 요청만
+sys.setprofile로 함수 호출을 추적해, 요청이 끝나면 PROFILE_DIR에 두 파일을 쓴다.
+
+- <이름>.folded : 접힌 스택 (한 줄에 `함수;함수;함수 마이크로초`)
+  flamegraph.pl, speedscope 등에 그대로 넣을 수 있다.
+- <이름>.txt    : 분류별(DB/정규식·토큰화/외부 HTTP/기타) 시간, Database 메서드별 시간,
+  자체 시간 기준 상위 N개 함수
+
+켜는 방법 (둘 다 설정하지 않으면 훅을 등록하지 않아 비용이 없다):
+    PROFILE_SAMPLE_RATE=0.01     요청의 1%를 무작위로 프로파일링
+    PROFILE_TOKEN=비밀값          `X-Profile: 비밀값` 헤더가 있는 요청만 프로파일링
+
+보고서는 최근 PROFILE_MAX_REPORTS개(기본 200)만 남기고 오래된 것부터 지운다.
+"""
+import os
+import random
+import re
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+
+PROFILE_HEADER = 'X-Profile'
+PROFILE_ENVIRON_KEY = 'HTTP_' + PROFILE_HEADER.upper().replace('-', '_')
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0) or 0)
+PROFILE_TOKEN = os.environ.get('PROFILE_TOKEN', '')
+PROFILE_DIR = os.environ.get('PROFILE_DIR', os.path.join('data', 'profiles'))
+PROFILE_TOP_N = int(os.environ.get('PROFILE_TOP_N', 30))
+PROFILE_MAX_REPORTS = int(os.environ.get('PROFILE_MAX_REPORTS', 200))
+REPORT_EXTENSIONS = ('.folded', '.txt')
+
+# 분류 (자체 시간은 스택에서 가장 안쪽에 있는 분류로 계산)
+CATEGORY_DATABASE = 'database'
+CATEGORY_REGEX = 'regex/tokenize'
+CATEGORY_HTTP = 'http'
+CATEGORY_OTHER = 'other'
+
+DATABASE_MODULES = ('database', 'sqlite3', '_sqlite3')
+REGEX_MODULES = ('re', 'sre_compile', 'sre_parse', '_sre')
+HTTP_MODULES = ('requests', 'urllib3', 'http', 'httpx', 'httpcore', 'socket', 'ssl', '_socket', '_ssl')
+# 정규식 외에 토큰화로 볼 함수 (모듈.이름)
+TOKENIZER_FUNCTIONS = {
+    'annotation.tokenize_page',
+    'dictionary.normalize_word',
+    'dictionary.lemma_candidates',
+    'readability.SentenceBatch.__init__',
+    'readability.split_book_sentences',
+    'app.extract_game_sentences',
+}
+
+UNSAFE_FILENAME_RE = re.compile(r'[^A-Za-z0-9_.-]+')
+
+
+def classify(name):
+    """함수 이름(모듈.이름) → 분류 (해당 없으면 None)"""
+    if name in TOKENIZER_FUNCTIONS:
+        return CATEGORY_REGEX
+    module = name.split('.', 1)[0]
+    if module in DATABASE_MODULES:
+        return CATEGORY_DATABASE
+    if module in REGEX_MODULES:
+        return CATEGORY_REGEX
+    if module in HTTP_MODULES:
+        return CATEGORY_HTTP
+    return None
+
+
+def builtin_name(func):
+    """C 함수/메서드 이름 (예: sqlite3.Cursor.execute, re.Pattern.findall)"""
+    module = getattr(func, '__module__', None)
+    owner = getattr(func, '__self__', None)
+    if not module and owner is not None and not isinstance(owner, type(sys)):
+        module = type(owner).__module__
+    qualname = getattr(func, '__qualname__', None) or getattr(func, '__name__', '?')
+    if module in (None, 'builtins'):
+        return qualname
+    return f'{module}.{qualname}'
+
+
+class RequestProfiler:
+    """한 스레드의 함수 호출을 추적해 스택별/함수별 시간을 모음"""
+
+    def __init__(self):
+        self.stacks = defaultdict(float)        # 스택 경로 → 자체 시간
+        self.functions = defaultdict(lambda: [0, 0.0, 0.0])  # 함수 → [호출 수, 자체 시간, 누적 시간]
+        self.categories = defaultdict(float)
+        self.database_methods = defaultdict(float)
+        self.started = None
+        self.elapsed = 0.0
+        self._stack = []
+        self._active = defaultdict(int)         # 재귀 호출의 누적 시간을 한 번만 세기 위한 깊이
+        self._names = {}
+
+    def _frame_name(self, frame):
+        code = frame.f_code
+        name = self._names.get(code)
+        if name is None:
+            module = frame.f_globals.get('__name__') or os.path.basename(code.co_filename)
+            name = f'{module}.{getattr(code, "co_qualname", code.co_name)}'
+            self._names[code] = name
+        return name
+
+    def _push(self, name, now):
+        if self._stack:
+            parent = self._stack[-1]
+            path = parent[1] + (name,)
+            category = classify(name) or parent[4]
+            database_method = parent[5]
+        else:
+            path = (name,)
+            category = classify(name) or CATEGORY_OTHER
+            database_method = None
+        if name.startswith('database.Database.') and '<locals>' not in name:
+            database_method = name[len('database.'):]
+        self._active[name] += 1
+        # [이름, 경로, 시작 시각, 자식 시간, 분류, Database 메서드]
+        self._stack.append([name, path, now, 0.0, category, database_method])
+
+    def _pop(self, now):
+        name, path, start, child, category, database_method = self._stack.pop()
+        total = now - start
+        self_time = total - child
+        self.stacks[path] += self_time
+        self.categories[category] += self_time
+        if category == CATEGORY_DATABASE and database_method:
+            self.database_methods[database_method] += self_time
+
+        stats = self.functions[name]
+        stats[0] += 1
+        stats[1] += self_time
+        self._active[name] -= 1
+        if not self._active[name]:
+            stats[2] += total
+        if self._stack:
+            self._stack[-1][3] += total
+
+    def _callback(self, frame, event, arg):
+        now = time.perf_counter()
+        if event == 'call':
+            self._push(self._frame_name(frame), now)
+        elif event == 'c_call':
+            self._push(builtin_name(arg), now)
+        elif self._stack:
+            # return / c_return / c_exception
+            self._pop(now)
+
+    def start(self):
+        """추적 시작 (이 스레드에서 이후 호출되는 함수만 추적)"""
+        self.started = time.perf_counter()
+        sys.setprofile(self._callback)
+
+    def stop(self):
+        """추적 종료 (시작한 스레드에서 호출)"""
+        sys.setprofile(None)
+        now = time.perf_counter()
+        self.elapsed = now - self.started
+        while self._stack:
+            self._pop(now)
+
+    def folded(self):
+        """접힌 스택 텍스트 (시간 단위: 마이크로초)"""
+        lines = []
+        for path, seconds in sorted(self.stacks.items()):
+            micros = int(seconds * 1_000_000)
+            if micros:
+                lines.append(f"{';'.join(path)} {micros}")
+        return '\n'.join(lines) + '\n'
+
+    def summary(self, title, top_n=PROFILE_TOP_N):
+        """분류별 시간 + Database 메서드별 시간 + 상위 함수"""
+        total = self.elapsed or 1e-9
+        lines = [title, f'전체: {self.elapsed * 1000:.2f}ms', '', '[분류별 자체 시간]']
+        for category, seconds in sorted(self.categories.items(), key=lambda item: -item[1]):
+            lines.append(f'{category:<16}{seconds * 1000:>10.2f}ms {seconds / total * 100:>6.1f}%')
+
+        if self.database_methods:
+            lines += ['', '[Database 메서드별 시간]']
+            for method, seconds in sorted(self.database_methods.items(), key=lambda item: -item[1]):
+                lines.append(f'{method:<48}{seconds * 1000:>10.2f}ms')
+
+        lines += ['', f'[자체 시간 상위 {top_n}개 함수]',
+                  f'{"호출 수":>8} {"자체(ms)":>10} {"누적(ms)":>10}  함수']
+        top = sorted(self.functions.items(), key=lambda item: -item[1][1])[:top_n]
+        for name, (calls, self_time, cumulative) in top:
+            lines.append(f'{calls:>8} {self_time * 1000:>10.2f} {cumulative * 1000:>10.2f}  {name}')
+        return '\n'.join(lines) + '\n'
+
+
+def should_profile(environ):
+    """이 요청을 프로파일링할지 (헤더 토큰 또는 샘플링)"""
+    if PROFILE_TOKEN and environ.get(PROFILE_ENVIRON_KEY) == PROFILE_TOKEN:
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+def prune_reports(directory=PROFILE_DIR, max_reports=PROFILE_MAX_REPORTS):
+    """보고서가 max_reports개를 넘으면 오래된 것부터 삭제 → 삭제한 보고서 수
+
+    파일 이름이 시각으로 시작하므로 이름순이 곧 오래된 순이다.
+    """
+    names = sorted({os.path.splitext(filename)[0] for filename in os.listdir(directory)
+                    if filename.endswith(REPORT_EXTENSIONS)})
+    expired = names[:max(0, len(names) - max_reports)]
+    for name in expired:
+        for extension in REPORT_EXTENSIONS:
+            try:
+                os.remove(os.path.join(directory, name + extension))
+            except FileNotFoundError:
+                # 다른 워커가 먼저 지운 경우
+                pass
+    return len(expired)
+
+
+def write_report(profiler, method, path, directory=PROFILE_DIR):
+    """프로파일 결과 파일 저장 (오래된 보고서 정리) → 파일 이름(확장자 제외)"""
+    os.makedirs(directory, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+    slug = UNSAFE_FILENAME_RE.sub('_', path.strip('/')) or 'root'
+    name = f'{stamp}_{method}_{slug}_{profiler.elapsed * 1000:.0f}ms'
+    with open(os.path.join(directory, name + '.folded'), 'w', encoding='utf-8') as f:
+        f.write(profiler.folded())
+    with open(os.path.join(directory, name + '.txt'), 'w', encoding='utf-8') as f:
+        f.write(profiler.summary(f'{method} {path}'))
+    prune_reports(directory)
+    return name
+
+
+class ProfilingMiddleware:
+    """선택된 요청만 프로파일링하는 WSGI 미들웨어
+
+    선택되지 않은 요청의 비용은 헤더 확인과 난수 하나뿐이다. 응답 헤더를 보낼 때
+    추적을 멈추고 보고서를 저장한 뒤, 파일 이름을 X-Profile-Report 헤더로 돌려준다.
+    """
+
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+
+    def __call__(self, environ, start_response):
+        if not should_profile(environ):
+            return self.wsgi_app(environ, start_response)
+
+        profiler = RequestProfiler()
+        method = environ.get('REQUEST_METHOD', '')
+        path = environ.get('PATH_INFO', '')
+
+        def profiled_start_response(status, headers, exc_info=None):
+            if not profiler.elapsed:
+                profiler.stop()
+                try:
+                    headers = list(headers) + [('X-Profile-Report', write_report(profiler, method, path))]
+                except Exception as e:
+                    print(f"프로파일 저장 오류: {e}")
+            return start_response(status, headers, exc_info)
+
+        profiler.start()
+        try:
+            return self.wsgi_app(environ, profiled_start_response)
+        finally:
+            # 예외 등으로 응답 헤더를 보내기 전에 끝난 경우
+            if not profiler.elapsed:
+                profiler.stop()
+
+
+def init_profiling(app):
+    """Flask 앱에 프로파일링 미들웨어 등록 (설정이 없으면 아무것도 하지 않음)"""
+    if not PROFILE_TOKEN and PROFILE_SAMPLE_RATE <= 0:
+        return False
+    app.wsgi_app = ProfilingMiddleware(app.wsgi_app)
+    return True
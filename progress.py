@@ -0,0 +1,114 @@
+"""읽기 위치 체크포인트 (쓰기 모아서 저장)
+
+리더는 페이지를 넘길 때마다 현재 위치를 보낸다. 요청마다 DB에 쓰지 않고
+(사용자, 책)별 마지막 위치만 메모리에 남겨 두었다가, 일정 간격마다(또는 종료 시)
+한 트랜잭션으로 reading_progress에 저장한다. 페이지를 읽은 보상(경험치/포인트/활동 기록)도
+사용자별로 읽은 페이지 수만 모아 두었다가 저장할 때 한 번에 반영하므로,
+페이지 넘김 요청은 DB를 기다리지 않는다.
+"""
+import os
+import threading
+from collections import defaultdict
+from datetime import datetime
+
+# 버퍼를 DB에 저장하는 간격 (초)
+FLUSH_INTERVAL = float(os.environ.get('PROGRESS_FLUSH_INTERVAL', 2.0))
+
+
+class ProgressBuffer:
+    """(user_id, book_id)별 최신 체크포인트를 모아 두는 버퍼"""
+
+    def __init__(self, db, flush_interval=FLUSH_INTERVAL, on_pages_read=None):
+        """on_pages_read(user_id, pages_read): 저장할 때 모아 둔 읽은 페이지 수로 호출 (보상 처리)
+
+        예외가 나면 그 페이지 수를 다시 모아 두고 다음 저장 때 다시 호출하므로,
+        on_pages_read는 한 트랜잭션으로 반영하고 실패하면 아무것도 남기지 않아야 한다.
+        """
+        self.db = db
+        self.flush_interval = flush_interval
+        self.on_pages_read = on_pages_read
+        self._pending = {}
+        self._pages_read = defaultdict(int)
+        self._lock = threading.Lock()
+        # flush()가 동시에 두 번 실행되지 않도록 (주기 저장 + 종료 시 저장)
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def record(self, user_id, book_id, position, total_read=None, completed=False, pages_read=0):
+        """체크포인트 기록 (메모리만 갱신)"""
+        key = (user_id, book_id)
+        now = datetime.now().isoformat(timespec='milliseconds')
+        with self._lock:
+            if pages_read:
+                self._pages_read[user_id] += pages_read
+            previous = self._pending.get(key)
+            total_read = max(position, total_read or 0)
+            if previous:
+                total_read = max(total_read, previous['total_read'])
+                completed = completed or previous['completed']
+            self._pending[key] = {
+                'user_id': user_id,
+                'book_id': book_id,
+                'current_position': position,
+                'total_read': total_read,
+                'completed': bool(completed),
+                'last_read': now,
+            }
+
+    def get(self, user_id, book_id):
+        """현재 체크포인트 (아직 저장 안 된 값이 있으면 그것을 우선)"""
+        with self._lock:
+            pending = self._pending.get((user_id, book_id))
+        if pending:
+            return dict(pending)
+        return self.db.get_reading_progress(user_id, book_id)
+
+    def flush(self):
+        """모인 체크포인트를 한 번에 저장 → 저장한 개수"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                pages_read, self._pages_read = self._pages_read, defaultdict(int)
+
+            saved = 0
+            if batch:
+                try:
+                    self.db.save_reading_progress(list(batch.values()))
+                    saved = len(batch)
+                except Exception as e:
+                    print(f"읽기 진도 저장 오류: {e}")
+                    # 그사이 들어온 더 새로운 값은 덮어쓰지 않고 다시 넣어 둠
+                    with self._lock:
+                        for key, checkpoint in batch.items():
+                            self._pending.setdefault(key, checkpoint)
+
+            for user_id, pages in pages_read.items():
+                if not self.on_pages_read:
+                    break
+                try:
+                    self.on_pages_read(user_id, pages)
+                except Exception as e:
+                    print(f"읽기 보상 저장 오류: {e}")
+                    with self._lock:
+                        self._pages_read[user_id] += pages
+            return saved
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def start(self):
+        """주기적으로 저장하는 백그라운드 스레드 시작"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='progress-flush', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """백그라운드 스레드를 멈추고 남은 체크포인트 저장 (종료 시 호출)"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
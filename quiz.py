@@ -0,0 +1,207 @@
+import random
+import re
+import threading
+from collections import defaultdict
+
+# 품사 추정용 접미사 규칙 (단어장에는 품사 정보가 없으므로 형태로 추정)
+POS_SUFFIXES = [
+    ('adverb', ('ly',)),
+    ('verb', ('ing', 'ed', 'ize', 'ise', 'ify', 'ate')),
+    ('adjective', ('ous', 'ful', 'ive', 'able', 'ible', 'al', 'ic', 'less', 'ish')),
+    ('noun', ('tion', 'sion', 'ment', 'ness', 'ity', 'ship', 'ance', 'ence', 'er', 'or', 'ist')),
+]
+
+# 한 단어가 같은 번역 글자를 공유하는 후보를 찾을 때 살펴볼 최대 개수
+MAX_POSTINGS = 64
+
+
+def guess_part_of_speech(word):
+    """접미사로 품사 추정"""
+    word = (word or '').lower()
+    for pos, suffixes in POS_SUFFIXES:
+        for suffix in suffixes:
+            if len(word) > len(suffix) + 2 and word.endswith(suffix):
+                return pos
+    return 'other'
+
+
+def length_bucket(word):
+    """단어 길이 구간 (짧은/중간/긴 단어)"""
+    length = len(word or '')
+    if length <= 4:
+        return 0
+    if length <= 7:
+        return 1
+    return 2
+
+
+def translation_bigrams(text):
+    """번역문의 글자 bigram 집합 (한국어 번역 유사도 계산용)"""
+    text = re.sub(r'[\s\W]+', '', text or '')
+    if len(text) < 2:
+        return {text} if text else set()
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+class DistractorIndex:
+    """한 사용자 단어장에 대한 오답 선택지 인덱스
+
+    단어를 (품사, 길이 구간) 버킷으로 나누고, 번역문 bigram 역색인을 만들어
+    문제마다 전체 단어장을 훑지 않고 비슷한 오답을 고를 수 있게 한다.
+    번역이 있는 단어는 모두 문제로 낼 수 있고, 오답 후보(pool)에는 같은 번역이
+    한 번만 들어간다.
+    """
+
+    def __init__(self, vocabulary):
+        self.entries = []
+        self.pool = []
+        self.buckets = defaultdict(list)
+        self.pos_groups = defaultdict(list)
+        self.postings = defaultdict(list)
+
+        seen = set()
+        for vocab in vocabulary:
+            translation = (vocab.get('translation') or '').strip()
+            if not translation:
+                continue
+
+            idx = len(self.entries)
+            pos = guess_part_of_speech(vocab['word'])
+            bucket = (pos, length_bucket(vocab['word']))
+            grams = translation_bigrams(translation)
+            self.entries.append({
+                'id': vocab['id'],
+                'word': vocab['word'],
+                'translation': translation,
+                'bucket': bucket,
+                'grams': grams,
+            })
+            # 같은 번역이 선택지에 두 번 나오지 않도록 오답 후보는 번역당 하나만
+            if translation in seen:
+                continue
+            seen.add(translation)
+            self.pool.append(idx)
+            self.buckets[bucket].append(idx)
+            self.pos_groups[pos].append(idx)
+            for gram in grams:
+                postings = self.postings[gram]
+                if len(postings) < MAX_POSTINGS:
+                    postings.append(idx)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def distractors(self, idx, count, rng):
+        """정답(idx)에 대한 오답 번역 count개 선택"""
+        entry = self.entries[idx]
+        chosen = []
+        used = {idx}
+
+        def take(candidates):
+            for cand in candidates:
+                if len(chosen) >= count:
+                    return
+                # 정답과 번역이 같은 단어는 오답이 될 수 없음
+                if cand not in used and self.entries[cand]['translation'] != entry['translation']:
+                    used.add(cand)
+                    chosen.append(cand)
+
+        # 1. 번역이 비슷한 단어 (같은 버킷 우선)
+        overlap = defaultdict(int)
+        for gram in entry['grams']:
+            for cand in self.postings.get(gram, ()):
+                overlap[cand] += 1
+        similar = sorted(
+            (cand for cand in overlap if cand != idx),
+            key=lambda c: (self.entries[c]['bucket'] != entry['bucket'], -overlap[c], rng.random())
+        )
+        take(similar[:count])
+
+        # 2. 같은 품사/길이 버킷 → 같은 품사 → 전체 순으로 채우기
+        for group in (self.buckets[entry['bucket']], self.pos_groups[entry['bucket'][0]]):
+            if len(chosen) >= count:
+                break
+            take(rng.sample(group, min(len(group), count * 2)))
+        if len(chosen) < count:
+            take(rng.sample(self.pool, min(len(self.pool), count * 3)))
+
+        return [self.entries[c]['translation'] for c in chosen]
+
+
+def grade_answers(vocabulary, answers):
+    """고른 선택지 채점 → [{'vocabulary_id', 'correct', 'answer'}, ...]
+
+    answers: [{'vocabulary_id': int, 'answer': 고른 번역}, ...]
+    정답은 단어장에 저장된 번역과 비교하며, 단어장에 없거나 중복된 id는 뺀다.
+    """
+    translations = {vocab['id']: (vocab.get('translation') or '').strip() for vocab in vocabulary}
+    graded = []
+    seen = set()
+    for item in answers:
+        if not isinstance(item, dict):
+            continue
+        vocab_id = item.get('vocabulary_id')
+        if not isinstance(vocab_id, int) or vocab_id not in translations or vocab_id in seen:
+            continue
+        seen.add(vocab_id)
+        answer = translations[vocab_id]
+        choice = item.get('answer')
+        graded.append({
+            'vocabulary_id': vocab_id,
+            'correct': bool(answer) and isinstance(choice, str) and choice.strip() == answer,
+            'answer': answer,
+        })
+    return graded
+
+
+class QuizGenerator:
+    """사용자별 오답 인덱스를 캐시해 두고 퀴즈를 한 번에 생성"""
+
+    def __init__(self, db):
+        self.db = db
+        self._indexes = {}
+        self._lock = threading.Lock()
+
+    def get_index(self, user_id):
+        """단어장 버전이 바뀐 경우에만 인덱스 재생성 (버전은 워커 간 공유 캐시 기준)"""
+        version = self.db.cache.version('vocabulary')
+        with self._lock:
+            cached = self._indexes.get(user_id)
+            if cached and version is not None and cached[0] == version:
+                return cached[1]
+
+        index = DistractorIndex(self.db.get_vocabulary(user_id))
+        with self._lock:
+            self._indexes[user_id] = (version, index)
+        return index
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._indexes.pop(user_id, None)
+
+    def grade(self, user_id, answers):
+        """사용자 단어장 기준으로 채점 (grade_answers 참고)"""
+        return grade_answers(self.db.get_vocabulary(user_id), answers)
+
+    def generate(self, user_id, num_questions=10, num_options=4, seed=None):
+        """N문항 퀴즈 생성 (선택지 num_options개)"""
+        index = self.get_index(user_id)
+        # 서로 다른 번역이 선택지 수만큼은 있어야 함
+        if len(index.pool) < num_options:
+            return []
+
+        rng = random.Random(seed)
+        picks = rng.sample(range(len(index)), min(num_questions, len(index)))
+
+        questions = []
+        for idx in picks:
+            entry = index.entries[idx]
+            options = index.distractors(idx, num_options - 1, rng) + [entry['translation']]
+            rng.shuffle(options)
+            # 정답은 보내지 않음 (채점은 서버에서)
+            questions.append({
+                'vocabulary_id': entry['id'],
+                'word': entry['word'],
+                'options': options,
+            })
+        return questions
@@ -0,0 +1,239 @@
+"""문장 난이도(가독성) 일괄 채점
+
+회화 연습 문장과 책 문장마다 단어 길이, 음절 수, 단어 빈도 순위, 문장 길이로
+점수를 매기고 1~LEVELS 단계로 나눠 저장한다. 게임/리더는 (level, level_rank)
+인덱스로 학습자 수준의 문장을 바로 고른다.
+
+단어 특징(길이/음절/희귀도)은 단어가 나올 때마다 다시 세지 않고, 서로 다른
+단어마다 한 번만 계산해 두고 문장별로 더한다.
+
+단어 빈도 순위는 WORD_FREQUENCY_PATH 파일(한 줄에 한 단어, 자주 쓰는 순)이 있으면
+그것을, 없으면 채점하는 문장들 안에서의 출현 횟수를 쓴다.
+
+실행 (전체 다시 채점):
+    python readability.py
+"""
+import math
+import os
+import random
+import re
+import time
+from bisect import bisect_right
+from collections import Counter
+
+# 난이도 단계 수 (1: 가장 쉬움)
+LEVELS = 5
+# 점수 → 단계 경계 (점수가 경계 이상이면 다음 단계)
+LEVEL_THRESHOLDS = (3.0, 5.0, 7.5, 10.0)
+# 채점 방식이 바뀌면 올려서 저장된 단계를 다시 계산하게 함
+READABILITY_VERSION = 1
+
+# 점수 = Flesch-Kincaid 학년 + 희귀도/단어 길이 보정
+WORDS_WEIGHT = 0.39
+SYLLABLES_WEIGHT = 11.8
+BASE_SCORE = -15.59
+RARITY_WEIGHT = 6.0
+WORD_LENGTH_WEIGHT = 0.5
+# 짧은 문장은 단어 평균이 한두 단어에 좌우되지 않도록 평균 단어 PRIOR_WORDS개를 더해 계산
+PRIOR_WORDS = 3
+AVERAGE_SYLLABLES = 1.4
+AVERAGE_RARITY = 0.5
+AVERAGE_WORD_LENGTH = 4.5
+
+# 책에서 저장할 문장 길이 (단어 수)
+MIN_SENTENCE_WORDS = 3
+MAX_SENTENCE_WORDS = 30
+
+WORD_FREQUENCY_PATH = os.environ.get('WORD_FREQUENCY_PATH', os.path.join('data', 'word_frequency.txt'))
+
+WORD_RE = re.compile(r"[a-z]+(?:'[a-z]+)*")
+SENTENCE_RE = re.compile(r'[^.!?]+[.!?]*')
+VOWEL_GROUP_RE = re.compile(r'[aeiouy]+')
+
+
+def count_syllables(word):
+    """모음 묶음 수로 음절 수 추정 (끝의 묵음 e 제외, 최소 1)"""
+    count = len(VOWEL_GROUP_RE.findall(word))
+    if word.endswith('e') and not word.endswith(('le', 'ee', 'ye')) and count > 1:
+        count -= 1
+    return max(1, count)
+
+
+def level_for_score(score):
+    """점수 → 난이도 단계 (1~LEVELS)"""
+    return bisect_right(LEVEL_THRESHOLDS, score) + 1
+
+
+def learner_level(profile_level):
+    """사용자 레벨 → 추천 문장 난이도 단계 (2레벨마다 한 단계)"""
+    return max(1, min(LEVELS, ((profile_level or 1) + 1) // 2))
+
+
+def load_frequency_ranks(path=WORD_FREQUENCY_PATH):
+    """단어 빈도 목록 파일 → {단어: 순위} (파일이 없으면 None)"""
+    if not path or not os.path.exists(path):
+        return None
+    ranks = {}
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        for line in f:
+            word = line.split('\t')[0].strip().lower()
+            if word and not word.startswith('#'):
+                ranks.setdefault(word, len(ranks) + 1)
+    return ranks
+
+
+def sentence_score(words, syllables, rarity, letters):
+    """문장 점수 (단어 수와 문장 전체의 음절/희귀도/글자 수 합계로 계산)"""
+    if not words:
+        return 0.0
+    smoothed = words + PRIOR_WORDS
+    return (
+        BASE_SCORE
+        + WORDS_WEIGHT * words
+        + SYLLABLES_WEIGHT * (syllables + PRIOR_WORDS * AVERAGE_SYLLABLES) / smoothed
+        + RARITY_WEIGHT * (rarity + PRIOR_WORDS * AVERAGE_RARITY) / smoothed
+        + WORD_LENGTH_WEIGHT * (letters / words - AVERAGE_WORD_LENGTH)
+    )
+
+
+class SentenceBatch:
+    """채점할 문장 묶음 (문장별 단어 목록)"""
+
+    def __init__(self, texts):
+        self.sentences = [WORD_RE.findall(text.lower()) for text in texts]
+
+    def __len__(self):
+        return len(self.sentences)
+
+    def word_counts(self):
+        """문장별 단어 수"""
+        return [len(words) for words in self.sentences]
+
+    def word_features(self, ranks=None):
+        """서로 다른 단어마다 (글자 수, 음절 수, 희귀도 0~1)"""
+        if ranks is None:
+            # 빈도 목록이 없으면 이 묶음 안에서 많이 나온 순서로 순위를 매김
+            counts = Counter()
+            for words in self.sentences:
+                counts.update(words)
+            word_ranks = {word: rank for rank, (word, _) in enumerate(counts.most_common(), start=1)}
+            unknown = len(word_ranks) + 1
+        else:
+            word_ranks = ranks
+            unknown = len(ranks) + 1
+        log_scale = math.log2(unknown + 2)
+
+        features = {}
+        for words in self.sentences:
+            for word in words:
+                if word not in features:
+                    rank = word_ranks.get(word, unknown)
+                    features[word] = (len(word), count_syllables(word), math.log2(rank + 1) / log_scale)
+        return features
+
+    def scores(self, ranks=None):
+        """문장별 점수 목록"""
+        features = self.word_features(ranks)
+        scores = []
+        for words in self.sentences:
+            letters = syllables = rarity = 0
+            for word in words:
+                word_letters, word_syllables, word_rarity = features[word]
+                letters += word_letters
+                syllables += word_syllables
+                rarity += word_rarity
+            scores.append(sentence_score(len(words), syllables, rarity, letters))
+        return scores
+
+
+def assign_levels(scores, seed=0):
+    """점수 목록 → (단계 목록, 단계 내 순번 목록)
+
+    단계 내 순번은 섞어서 매기므로, 임의 순번부터 이어서 읽으면 무작위 표본이 된다.
+    """
+    levels = [level_for_score(score) for score in scores]
+    ranks = [0] * len(scores)
+    by_level = {}
+    for i, level in enumerate(levels):
+        by_level.setdefault(level, []).append(i)
+    rng = random.Random(seed)
+    for indexes in by_level.values():
+        rng.shuffle(indexes)
+        for rank, i in enumerate(indexes):
+            ranks[i] = rank
+    return levels, ranks
+
+
+def split_book_sentences(content):
+    """책 본문 → [(시작 위치, 공백 정리한 문장), ...] (너무 짧거나 긴 문장 제외)"""
+    sentences = []
+    for match in SENTENCE_RE.finditer(content):
+        text = ' '.join(match.group(0).split())
+        words = len(WORD_RE.findall(text.lower()))
+        if MIN_SENTENCE_WORDS <= words <= MAX_SENTENCE_WORDS:
+            sentences.append((match.start(), text))
+    return sentences
+
+
+def score_practice_sentences(db, ranks=None):
+    """회화 연습 문장 전체 채점 → 채점한 문장 수"""
+    if ranks is None:
+        ranks = load_frequency_ranks()
+    rows = db.get_practice_sentences_for_scoring()
+    batch = SentenceBatch(english for _, english in rows)
+    scores = batch.scores(ranks)
+    levels, level_ranks = assign_levels(scores)
+    db.save_practice_sentence_levels(zip(scores, levels, level_ranks, (row_id for row_id, _ in rows)))
+    db.set_meta('practice_sentences_scored', READABILITY_VERSION)
+    return len(rows)
+
+
+def score_book(db, book_id, ranks=None):
+    """책 한 권의 문장 채점 후 book_sentences에 저장 → 저장한 문장 수"""
+    try:
+        book = db.get_book(book_id)
+    except TypeError:
+        return 0
+    if ranks is None:
+        ranks = load_frequency_ranks()
+    sentences = split_book_sentences(book.get('content') or '')
+    batch = SentenceBatch(text for _, text in sentences)
+    scores = batch.scores(ranks)
+    levels, level_ranks = assign_levels(scores, seed=book_id)
+    db.replace_book_sentences(book_id, [
+        (position, text, word_count, score, level, level_rank)
+        for (position, text), word_count, score, level, level_rank
+        in zip(sentences, batch.word_counts(), scores, levels, level_ranks)
+    ])
+    # 저장할 문장이 없는 책도 채점한 것으로 기록 (매번 다시 채점하지 않도록)
+    db.set_meta(f'book_scored:{book_id}', READABILITY_VERSION)
+    return len(sentences)
+
+
+def ensure_practice_sentences_scored(db):
+    """채점 방식이 바뀌었거나 채점 안 된 문장이 있으면 다시 채점"""
+    if str(db.get_meta('practice_sentences_scored')) == str(READABILITY_VERSION) \
+            and db.count_unscored_practice_sentences() == 0:
+        return 0
+    return score_practice_sentences(db)
+
+
+def ensure_book_scored(db, book_id):
+    """채점 방식이 바뀌었거나 채점 안 된 책이면 채점 → 이번에 저장한 문장 수"""
+    if str(db.get_meta(f'book_scored:{book_id}')) == str(READABILITY_VERSION):
+        return 0
+    return score_book(db, book_id)
+
+
+if __name__ == '__main__':
+    from database import Database
+
+    db = Database()
+    ranks = load_frequency_ranks()
+    start = time.perf_counter()
+    count = score_practice_sentences(db, ranks)
+    print(f'회화 문장 {count}개 채점 ({time.perf_counter() - start:.2f}s)')
+    for book in db.get_all_books():
+        start = time.perf_counter()
+        count = score_book(db, book['id'], ranks)
+        print(f"{book['title']}: 문장 {count}개 채점 ({time.perf_counter() - start:.2f}s)")
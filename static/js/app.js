@@ -154,6 +154,55 @@ async function translateText(text) {
     }
 }
 
+// ============================
+// 읽기 위치 체크포인트
+// ============================
+async function loadReadingPosition(bookId) {
+    try {
+        const response = await fetch(`/api/books/${bookId}/progress`);
+        return await response.json();
+    } catch (error) {
+        console.error('읽기 위치 조회 오류:', error);
+        return { page: 0 };
+    }
+}
+
+// 서버는 메모리에만 기록하고 바로 응답하므로 기다리지 않음
+// (pagesRead: 읽은 페이지 보상 - 서버에서 모아서 경험치/포인트로 반영)
+function saveReadingPosition(bookId, page, totalPages, pagesRead = 0) {
+    fetch(`/api/books/${bookId}/progress`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ page: page, total_pages: totalPages, pages_read: pagesRead }),
+        keepalive: true
+    })
+        .then(response => response.json())
+        .then(result => {
+            if (result.points_earned > 0) {
+                showNotification(`⭐ ${result.points_earned} 포인트 획득!`, 'success');
+                scheduleRewardCheck();
+            }
+        })
+        .catch(error => console.error('읽기 위치 저장 오류:', error));
+}
+
+// 페이지 보상은 서버가 모아서 저장하므로(약 2초 간격), 잠시 뒤 프로필을 다시 읽어 레벨업 확인
+const REWARD_CHECK_DELAY = 3000;
+let rewardCheckTimer = null;
+
+function scheduleRewardCheck() {
+    clearTimeout(rewardCheckTimer);
+    rewardCheckTimer = setTimeout(checkLevelUp, REWARD_CHECK_DELAY);
+}
+
+async function checkLevelUp() {
+    const previousLevel = userProfile ? userProfile.level : null;
+    await loadUserProfile();
+    if (previousLevel !== null && userProfile && userProfile.level > previousLevel) {
+        showLevelUpAnimation(userProfile.level);
+    }
+}
+
 // ============================
 // 읽기 진도 업데이트
 // ============================
@@ -277,15 +326,31 @@ function highlightDifficultWords(text) {
     }).join(' ');
 }
 
+async function lookupWord(word) {
+    try {
+        const response = await fetch(`/api/dictionary/lookup?word=${encodeURIComponent(word)}`);
+        const result = await response.json();
+        return result.translation || await translateText(word);
+    } catch (error) {
+        console.error('사전 조회 오류:', error);
+        return translateText(word);
+    }
+}
+
 async function handleWordClick(word) {
-    const translation = await translateText(word);
+    const translation = await lookupWord(word);
     
     // 간단한 팝업으로 표시
     const shouldAdd = confirm(`${word}\n\n뜻: ${translation}\n\n단어장에 추가하시겠습니까?`);
     
     if (shouldAdd) {
         const bookId = parseInt(window.location.pathname.split('/').pop());
-        await addToVocabulary(word, translation, '', bookId || 1);
+        const added = await addToVocabulary(word, translation, '', bookId || 1);
+        
+        // 페이지에서 단어 표시를 갱신할 수 있도록 알림
+        if (added && typeof onVocabularyAdded === 'function') {
+            onVocabularyAdded();
+        }
     }
 }
 
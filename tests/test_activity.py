@@ -0,0 +1,63 @@
+"""연속 학습일 / 리더보드 테스트"""
+import os
+import tempfile
+import unittest
+from datetime import date, timedelta
+
+from cache import MemoryCacheBackend, SharedCache
+from database import Database
+
+
+class StreakTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db = Database(os.path.join(self.tmpdir.name, 'test.db'), cache=SharedCache(MemoryCacheBackend()))
+        self.start = date(2026, 9, 1)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def day(self, n):
+        return self.start + timedelta(days=n)
+
+    def streak_on_leaderboard(self, today):
+        entry = self.db.get_leaderboard('streak', limit=10, today=today)[0]
+        return entry['streak_days']
+
+    def test_consecutive_days(self):
+        for n in range(10):
+            streak = self.db.record_activity(1, pages_read=1, today=self.day(n))
+        self.assertEqual(streak, 10)
+        self.assertEqual(self.streak_on_leaderboard(self.day(9)), 10)
+
+    def test_same_day(self):
+        self.db.record_activity(1, pages_read=1, today=self.day(0))
+        self.db.record_activity(1, pages_read=1, today=self.day(1))
+        self.assertEqual(self.db.record_activity(1, pages_read=1, today=self.day(1)), 2)
+
+    def test_gap_resets(self):
+        self.db.record_activity(1, pages_read=1, today=self.day(0))
+        self.db.record_activity(1, pages_read=1, today=self.day(1))
+        self.assertEqual(self.db.record_activity(1, pages_read=1, today=self.day(3)), 1)
+
+    def test_stale_streak_reads_as_zero(self):
+        for n in range(10):
+            self.db.record_activity(1, pages_read=1, today=self.day(n))
+        # 다음 날까지는 아직 이어질 수 있음
+        self.assertEqual(self.streak_on_leaderboard(self.day(10)), 10)
+        self.assertEqual(self.db.get_user_profile(1, today=self.day(10))['streak_days'], 10)
+
+        later = self.day(48)
+        self.assertEqual(self.streak_on_leaderboard(later), 0)
+        self.assertEqual(self.db.get_user_profile(1, today=later)['streak_days'], 0)
+        points_board = self.db.get_leaderboard('points', today=later)
+        self.assertEqual(points_board[0]['streak_days'], 0)
+        self.assertEqual(points_board[0]['best_streak'], 10)
+
+    def test_weekly_streak_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.db.get_leaderboard('streak', period='week')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+"""프로파일 보고서 정리 테스트"""
+import os
+import tempfile
+import unittest
+
+from profiling import PROFILE_MAX_REPORTS, RequestProfiler, prune_reports, write_report
+
+
+class PruneReportsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.directory = self.tmpdir.name
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def touch(self, name):
+        for extension in ('.folded', '.txt'):
+            open(os.path.join(self.directory, name + extension), 'w').close()
+
+    def test_keeps_newest_reports(self):
+        for i in range(5):
+            self.touch(f'20260901-00000{i}-000000_GET_api_{i}ms')
+        open(os.path.join(self.directory, 'notes.md'), 'w').close()
+
+        self.assertEqual(prune_reports(self.directory, max_reports=2), 3)
+        self.assertEqual(sorted(os.listdir(self.directory)), [
+            '20260901-000003-000000_GET_api_3ms.folded',
+            '20260901-000003-000000_GET_api_3ms.txt',
+            '20260901-000004-000000_GET_api_4ms.folded',
+            '20260901-000004-000000_GET_api_4ms.txt',
+            'notes.md',
+        ])
+
+    def test_write_report_prunes(self):
+        for i in range(PROFILE_MAX_REPORTS + 100):
+            self.touch(f'20000101-000000-{i:06d}_GET_old_0ms')
+        profiler = RequestProfiler()
+        profiler.start()
+        profiler.stop()
+        name = write_report(profiler, 'GET', '/api/books', self.directory)
+        reports = {os.path.splitext(f)[0] for f in os.listdir(self.directory)}
+        self.assertIn(name, reports)
+        self.assertEqual(len(reports), PROFILE_MAX_REPORTS)
+
+
+if __name__ == '__main__':
+    unittest.main()
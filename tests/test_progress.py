@@ -0,0 +1,103 @@
+"""읽기 위치 버퍼 / 페이지 보상 테스트"""
+import os
+import tempfile
+import unittest
+from datetime import date
+from unittest import mock
+
+from cache import MemoryCacheBackend, SharedCache
+from database import Database
+from progress import ProgressBuffer
+
+
+class ProgressBufferTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db = Database(os.path.join(self.tmpdir.name, 'test.db'), cache=SharedCache(MemoryCacheBackend()))
+        self.awards = []
+        self.buffer = ProgressBuffer(self.db, flush_interval=60, on_pages_read=self.award)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def award(self, user_id, pages_read):
+        self.awards.append((user_id, pages_read))
+
+    def test_coalesces_checkpoints_into_one_write(self):
+        with mock.patch.object(self.db, 'save_reading_progress', wraps=self.db.save_reading_progress) as save:
+            for page in range(1, 6):
+                self.buffer.record(1, 7, page * 100, pages_read=1)
+            self.assertEqual(self.buffer.flush(), 1)
+        save.assert_called_once()
+        self.assertEqual(self.db.get_reading_progress(1, 7)['current_position'], 500)
+        self.assertEqual(self.awards, [(1, 5)])
+
+    def test_total_read_and_completed_never_go_back(self):
+        self.buffer.record(1, 7, 900, completed=True)
+        self.buffer.record(1, 7, 100)
+        self.assertEqual(self.buffer.get(1, 7)['total_read'], 900)
+        self.assertTrue(self.buffer.get(1, 7)['completed'])
+        self.buffer.flush()
+
+        self.buffer.record(1, 7, 50)
+        self.buffer.flush()
+        progress = self.db.get_reading_progress(1, 7)
+        self.assertEqual(progress['current_position'], 50)
+        self.assertEqual(progress['total_read'], 900)
+        self.assertTrue(progress['completed'])
+
+    def test_failed_checkpoint_write_is_retried(self):
+        self.buffer.record(1, 7, 300)
+        with mock.patch.object(self.db, 'save_reading_progress', side_effect=Exception('database is locked')):
+            self.assertEqual(self.buffer.flush(), 0)
+        self.assertIsNone(self.db.get_reading_progress(1, 7))
+
+        self.assertEqual(self.buffer.flush(), 1)
+        self.assertEqual(self.db.get_reading_progress(1, 7)['current_position'], 300)
+
+    def test_failed_reward_is_retried_with_pages_added_since(self):
+        self.buffer.on_pages_read = mock.Mock(side_effect=[Exception('database is locked'), None])
+        self.buffer.record(1, 7, 100, pages_read=1)
+        self.buffer.record(1, 7, 200, pages_read=1)
+        self.buffer.flush()
+        self.buffer.record(1, 7, 300, pages_read=1)
+        self.buffer.flush()
+        self.assertEqual(self.buffer.on_pages_read.call_args_list, [mock.call(1, 2), mock.call(1, 3)])
+
+
+class AwardActivityTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db = Database(os.path.join(self.tmpdir.name, 'test.db'), cache=SharedCache(MemoryCacheBackend()))
+        self.today = date(2026, 9, 1)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_failure_after_experience_update_commits_nothing(self):
+        before = self.db.get_user_profile(1)
+        with mock.patch.object(self.db, '_record_activity', side_effect=Exception('database is locked')):
+            with self.assertRaises(Exception):
+                self.db.award_activity(1, pages_read=3, experience=30, points=15, today=self.today)
+        self.assertEqual(self.db.get_user_profile(1)['experience'], before['experience'])
+        self.assertEqual(self.db.get_user_profile(1)['points'], before['points'])
+
+        self.db.award_activity(1, pages_read=3, experience=30, points=15, today=self.today)
+        after = self.db.get_user_profile(1, today=self.today)
+        self.assertEqual(after['experience'], before['experience'] + 30)
+        self.assertEqual(after['points'], before['points'] + 15)
+        conn = self.db.get_connection()
+        pages = conn.execute('SELECT pages_read FROM daily_activity WHERE user_id = 1').fetchone()[0]
+        conn.close()
+        self.assertEqual(pages, 3)
+
+    def test_level_up(self):
+        leveled_up, streak = self.db.award_activity(1, experience=100, today=self.today)
+        self.assertTrue(leveled_up)
+        self.assertEqual(streak, 1)
+        profile = self.db.get_user_profile(1, today=self.today)
+        self.assertEqual((profile['level'], profile['experience']), (2, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+"""단어 퀴즈 채점 테스트"""
+import os
+import tempfile
+import unittest
+
+from cache import MemoryCacheBackend, SharedCache
+from database import PERFECT_QUIZ_MIN_QUESTIONS, Database
+from quiz import QuizGenerator, grade_answers
+
+VOCABULARY = [
+    {'id': 1, 'word': 'big', 'translation': '큰'},
+    {'id': 2, 'word': 'large', 'translation': '큰'},
+    {'id': 3, 'word': 'cat', 'translation': '고양이'},
+    {'id': 4, 'word': 'dog', 'translation': '개'},
+    {'id': 5, 'word': 'run', 'translation': '달리다'},
+]
+
+
+class GradeAnswersTest(unittest.TestCase):
+    def test_grades_against_stored_translation(self):
+        graded = grade_answers(VOCABULARY, [
+            {'vocabulary_id': 3, 'answer': '고양이'},
+            {'vocabulary_id': 4, 'answer': '고양이'},
+            {'vocabulary_id': 5, 'correct': True},
+        ])
+        self.assertEqual([(g['vocabulary_id'], g['correct']) for g in graded], [(3, True), (4, False), (5, False)])
+
+    def test_ignores_unknown_and_duplicate_ids(self):
+        graded = grade_answers(VOCABULARY, [
+            {'correct': True},
+            {'vocabulary_id': 99, 'answer': '큰'},
+            {'vocabulary_id': 3, 'answer': '고양이'},
+            {'vocabulary_id': 3, 'answer': '고양이'},
+            'not a dict',
+        ])
+        self.assertEqual([g['vocabulary_id'] for g in graded], [3])
+
+
+class QuizResultTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db = Database(os.path.join(self.tmpdir.name, 'test.db'), cache=SharedCache(MemoryCacheBackend()))
+        for vocab in VOCABULARY:
+            self.db.add_vocabulary(1, vocab)
+        self.vocabulary = self.db.get_vocabulary(1)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def perfect_answers(self, count):
+        return [{'vocabulary_id': v['id'], 'correct': True} for v in self.vocabulary[:count]]
+
+    def test_short_quiz_is_not_perfect(self):
+        result = self.db.save_quiz_result(1, self.perfect_answers(1))
+        self.assertEqual(result['perfect_count'], 0)
+        result = self.db.save_quiz_result(1, self.perfect_answers(PERFECT_QUIZ_MIN_QUESTIONS))
+        self.assertEqual(result['perfect_count'], 1)
+
+    def test_correct_answer_does_not_mark_learned(self):
+        self.db.save_quiz_result(1, self.perfect_answers(1))
+        self.assertFalse(any(v['learned'] for v in self.db.get_vocabulary(1)))
+
+    def test_generated_questions_include_duplicate_translations_without_answers(self):
+        questions = QuizGenerator(self.db).generate(1, num_questions=10, num_options=3, seed=1)
+        self.assertEqual(len(questions), len(VOCABULARY))
+        for question in questions:
+            self.assertNotIn('answer', question)
+            self.assertEqual(len(set(question['options'])), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()